@@ -7,3 +7,4 @@ class AdsConfig(AppConfig):
 
     def ready(self):
         import ads.signals
+        import ads.handlers
@@ -0,0 +1,9 @@
+from sync.models import Event
+from sync.services.events import subscribe
+from .services.update_data_for_ads import sync_apartment
+
+
+@subscribe(Event.Name.ANNOUNCEMENT_MODERATED, Event.Name.ANNOUNCEMENT_PRICE_CHANGED)
+def announcement_apartment(event):
+    # Moderated flats are shown as apartments of the residential complex with their price per meter
+    sync_apartment(event.aggregate_id)
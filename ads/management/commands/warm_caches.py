@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from swipe.warming import warm_caches
+
+
+class Command(BaseCommand):
+    help = 'Fill the feed, residential complex and notary page caches with the most requested pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--feed-pages', type=int, default=50, help='Most requested feed pages to warm')
+        parser.add_argument(
+            '--base-url',
+            help='Scheme and host of the pages, WARM_CACHES_BASE_URL or the domain of the current Site by default',
+        )
+        parser.add_argument('--workers', type=int, default=4, help='Pages requested at once')
+
+    def handle(self, *args, **options):
+        statuses = warm_caches(options['feed_pages'], options['base_url'], options['workers'])
+        if not statuses:
+            self.stdout.write('Nothing to warm: no superuser')
+        for uri, status in statuses.items():
+            self.stdout.write(f'{status} {uri}')
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.14 on 2026-10-19 02:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ads', '0004_auto_20220912_1853'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='advertising',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['date_end'], name='ads_advertising_expiry'),
+        ),
+    ]
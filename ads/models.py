@@ -145,9 +145,30 @@ class Announcement(models.Model):
     class Meta:
         ordering = ('id',)
 
+    # Fields whose saved values the signals compare to publish the moderation and price events
+    TRACKED_FIELDS = ('is_moderation_check', 'price', 'area')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_saved_state()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.remember_saved_state()
+
+    def remember_saved_state(self):
+        # Read from __dict__ so deferred fields are not loaded, unknown values are None
+        self._saved_state = tuple(self.__dict__.get(name) for name in self.TRACKED_FIELDS)
+
     @property
     def preview_image(self):
-        obj = self.gallery_announcement.first()
+        images = getattr(self, '_prefetched_objects_cache', {}).get('gallery_announcement')
+        if images is not None:
+            obj = images[0] if images else None
+        else:
+            obj = self.gallery_announcement.first()
         if obj:
             return obj.image
 
@@ -205,6 +226,12 @@ class Advertising(models.Model):
     )
     announcement = models.OneToOneField(Announcement, on_delete=models.CASCADE, related_name='advertising')
 
+    class Meta:
+        indexes = [
+            # Active advertising by its end, see swipe.expiry
+            models.Index(fields=['date_end'], name='ads_advertising_expiry', condition=models.Q(is_active=True)),
+        ]
+
 
 class GalleryAnnouncement(models.Model):
     image = models.ImageField(upload_to='images/ads/gallery/announcements')
@@ -1,22 +1,13 @@
-from rest_framework import permissions
+from swipe.ownership import OwnershipPermission
 
 
-class IsMyAnnouncement(permissions.BasePermission):
+class IsMyAnnouncement(OwnershipPermission):
+    user_path = 'creator_id'
 
-    def has_object_permission(self, request, view, obj):
-        return request.user.user_announcement.filter(id=obj.pk).exists()
 
+class IsMyAdvertising(OwnershipPermission):
+    user_path = 'announcement.creator_id'
 
-class IsMyAdvertising(permissions.BasePermission):
 
-    def has_object_permission(self, request, view, obj):
-        return request.user.user_announcement.filter(advertising=obj.id).exists()
-
-
-class IsMyApartment(permissions.BasePermission):
-
-    def has_object_permission(self, request, view, obj):
-        if request.user.is_developer:
-            return request.user.user_residential_complex.residential_complex_announcement.filter(
-                announcement_apartment=obj).exists()
-        return False
+class IsMyApartment(OwnershipPermission):
+    complex_path = 'announcement.residential_complex_id'
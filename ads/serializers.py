@@ -3,6 +3,9 @@ from rest_framework import serializers
 from rest_framework.generics import get_object_or_404
 
 from housing.models import ResidentialComplex
+from swipe.serializers import CompiledListSerializer
+from sync.models import Change, Event
+from sync.services.events import publish_event
 from users.services.month_ahead import get_range_month
 from .models import (
     Announcement, Advertising, GalleryAnnouncement, Complaint, Apartment
@@ -36,7 +39,12 @@ class AnnouncementAdvertisingSerializer(serializers.ModelSerializer):
             )
         instance.date_end = get_range_month().date()
         instance.is_active = True
-        return super().update(instance, validated_data)
+        instance = super().update(instance, validated_data)
+        publish_event(
+            Event.Name.ADVERTISING_ACTIVATED, Change.Kind.ANNOUNCEMENT, instance.announcement_id,
+            advertising_id=instance.id, date_end=instance.date_end
+        )
+        return instance
 
 
 class AnnouncementSerializer(serializers.ModelSerializer):
@@ -107,6 +115,7 @@ class ApartmentSerializer(serializers.ModelSerializer):
             'corpus', 'section', 'floor', 'riser', 'is_booked',
             'announcement'
         ]
+        list_serializer_class = CompiledListSerializer
         read_only_fields = [
             'price_to_meter', 'announcement'
         ]
@@ -140,6 +149,16 @@ class ApartmentSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(errors)
         return data
 
+    def update(self, instance, validated_data):
+        was_booked = instance.is_booked
+        instance = super().update(instance, validated_data)
+        if instance.is_booked and not was_booked:
+            publish_event(
+                Event.Name.APARTMENT_BOOKED, Change.Kind.ANNOUNCEMENT, instance.announcement_id,
+                apartment_id=instance.id
+            )
+        return instance
+
 
 class ApartmentListSerializer(serializers.ModelSerializer):
     class Meta:
@@ -163,6 +182,8 @@ class ResidentialComplexListSerializer(serializers.ModelSerializer):
     class Meta:
         model = ResidentialComplex
         fields = ['id', 'preview_image', 'name', 'address', 'favorite_complex']
+        list_serializer_class = CompiledListSerializer
+        field_lookups = {'preview_image': ['gallery_residential_complex']}
 
 
 class AnnouncementListSerializer(serializers.ModelSerializer):
@@ -178,6 +199,28 @@ class AnnouncementListSerializer(serializers.ModelSerializer):
             'favorite_announcement', 'condition', 'payment_options',
             'residential_complex'
         ]
+        list_serializer_class = CompiledListSerializer
+        field_lookups = {'preview_image': ['gallery_announcement']}
+        expandable_fields = {'creator': CreatorSerializers, 'residential_complex': ResidentialComplexListSerializer}
+
+
+class ResidentialComplexSnapshotSerializer(ResidentialComplexListSerializer):
+    """
+    Residential complex of the public feed snapshots, without the users who added it to favorites
+    """
+
+    class Meta(ResidentialComplexListSerializer.Meta):
+        fields = [name for name in ResidentialComplexListSerializer.Meta.fields if name != 'favorite_complex']
+
+
+class AnnouncementSnapshotSerializer(AnnouncementListSerializer):
+    """
+    Announcement of the public feed snapshots, without the users who added it to favorites
+    """
+
+    class Meta(AnnouncementListSerializer.Meta):
+        fields = [name for name in AnnouncementListSerializer.Meta.fields if name != 'favorite_announcement']
+        expandable_fields = {'creator': CreatorSerializers, 'residential_complex': ResidentialComplexSnapshotSerializer}
 
 
 class AnnouncementRetrieveSerializer(AnnouncementListSerializer):
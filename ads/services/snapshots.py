@@ -0,0 +1,82 @@
+import gzip
+import os
+
+import brotli
+from django.conf import settings
+from django.core.cache import cache
+
+from swipe.renderers import ORJSONRenderer
+from swipe.versioning import get_versions
+from ads.filters import AnnouncementFilter
+from ads.models import Announcement, AnnouncementPurpose, AnnouncementRooms
+from ads.serializers import AnnouncementSnapshotSerializer, ResidentialComplexSnapshotSerializer
+from housing.models import ResidentialComplex
+from .versions import feed_data_version_keys
+
+SNAPSHOT_PATH = os.path.join('snapshots', 'feed')
+PUBLISHED_VERSIONS_KEY = 'snapshots:feed'
+
+
+def snapshot_dir():
+    return os.path.join(settings.MEDIA_ROOT, SNAPSHOT_PATH)
+
+
+def snapshot_filters():
+    """
+    Names and query parameters of the published feeds: the default feed, the feed per purpose and per rooms
+    """
+    yield 'default', {}
+    for purpose in AnnouncementPurpose:
+        yield f'purpose-{purpose.name.lower()}', {'purpose': purpose.value}
+    for rooms in AnnouncementRooms:
+        yield f'rooms-{rooms.value}', {'rooms': rooms.value}
+
+
+def render_snapshot(params):
+    """
+    Render the ``data`` of the feed filtered by ``params`` as the feed endpoint does, with relative media urls.
+    The snapshots are public, the users who added the announcements and complexes to favorites are left out
+    """
+    queryset = Announcement.objects.select_related(
+        'advertising', 'announcement_apartment'
+    ).prefetch_related('gallery_announcement').order_by('id')
+    queryset = AnnouncementFilter(params, queryset=queryset).qs
+    residential_complexes = ResidentialComplex.objects.prefetch_related('gallery_residential_complex').order_by('id')
+    data = (AnnouncementSnapshotSerializer(queryset, many=True).data
+            + ResidentialComplexSnapshotSerializer(residential_complexes, many=True).data)
+    return ORJSONRenderer().render({'data': data})
+
+
+def write_atomic(path, content):
+    """
+    Replace the file at ``path`` so readers see either the old or the new content, never a partial one
+    """
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(content)
+    os.replace(temporary, path)
+
+
+def publish_snapshot(name, content):
+    path = os.path.join(snapshot_dir(), f'{name}.json')
+    write_atomic(f'{path}.gz', gzip.compress(content, compresslevel=9))
+    write_atomic(f'{path}.br', brotli.compress(content, mode=brotli.MODE_TEXT))
+    write_atomic(path, content)
+
+
+def publish_feed_snapshots(force=False):
+    """
+    Render the snapshots of the feeds to MEDIA_ROOT/snapshots/feed/ unless the feed did not change
+    since the last publishing. Return the names of the published snapshots
+    """
+    versions = get_versions(feed_data_version_keys())
+    if not force and cache.get(PUBLISHED_VERSIONS_KEY) == versions:
+        return []
+    os.makedirs(snapshot_dir(), exist_ok=True)
+    names = []
+    for name, params in snapshot_filters():
+        publish_snapshot(name, render_snapshot(params))
+        names.append(name)
+    publish_snapshot('index', ORJSONRenderer().render(dict(snapshot_filters())))
+    cache.set(PUBLISHED_VERSIONS_KEY, versions, timeout=None)
+    return names
@@ -1,8 +1,40 @@
-from ads.models import Apartment
+from ads.models import Announcement, AnnouncementPurpose, Apartment
+from sync.models import Change, Event
+from sync.services.events import publish_event
 
 
-def update_or_create_apartment(instance):
-    if instance.purpose == 'Квартира' and instance.is_moderation_check is True:
-        Apartment.objects.update_or_create(
-            announcement=instance,
+def needs_apartment(announcement):
+    """
+    Moderated flats are shown as apartments in the residential complex
+    """
+    return announcement.purpose == AnnouncementPurpose.FLAT and announcement.is_moderation_check is True
+
+
+def sync_apartment(announcement_id):
+    """
+    Create the apartment of a moderated flat or refresh its price per meter after the announcement changed
+    """
+    announcement = Announcement.objects.filter(id=announcement_id).select_related('announcement_apartment').first()
+    if announcement is None or not needs_apartment(announcement):
+        return
+    try:
+        apartment = announcement.announcement_apartment
+    except Apartment.DoesNotExist:
+        Apartment(announcement=announcement, number=announcement.id).save()
+        return
+    if apartment.price_to_meter != round(announcement.price / announcement.area):
+        apartment.save(update_fields=['price_to_meter'])
+
+
+def publish_announcement_events(announcement):
+    """
+    Publish the moderation or the price change of the saved announcement, whichever way it was saved
+    """
+    moderated, price, area = getattr(announcement, '_saved_state', (None, None, None))
+    if announcement.is_moderation_check and moderated is not True:
+        publish_event(Event.Name.ANNOUNCEMENT_MODERATED, Change.Kind.ANNOUNCEMENT, announcement.id)
+    elif moderated is not None and (price, area) != (announcement.price, announcement.area):
+        publish_event(
+            Event.Name.ANNOUNCEMENT_PRICE_CHANGED, Change.Kind.ANNOUNCEMENT, announcement.id,
+            price=announcement.price, area=announcement.area
         )
@@ -0,0 +1,28 @@
+from swipe.versioning import version_key, bump_versions
+
+
+def bump_announcement_versions(announcement_ids, residential_complex_ids=()):
+    """
+    Invalidate the feed, the given announcements and the residential complexes that list them
+    """
+    bump_versions([
+        version_key('announcement'),
+        *(version_key('announcement', pk) for pk in announcement_ids),
+        *(version_key('complex', pk) for pk in residential_complex_ids if pk is not None),
+    ])
+
+
+def feed_data_version_keys():
+    return [version_key('announcement'), version_key('complex')]
+
+
+def feed_version_keys(view, request, *args, **kwargs):
+    return [*feed_data_version_keys(), version_key('filters', request.user.pk)]
+
+
+def announcement_version_keys(view, request, *args, **kwargs):
+    return [version_key('announcement', kwargs[view.lookup_url_kwarg or view.lookup_field])]
+
+
+def favorites_announcement_version_keys(view, request, *args, **kwargs):
+    return [version_key('favorites_announcement', request.user.pk), version_key('announcement')]
@@ -1,8 +1,9 @@
 from django.dispatch import receiver
-from django.db.models.signals import post_save
-from ads.models import Announcement
+from django.db.models.signals import post_save, post_delete
+from ads.models import Announcement, Advertising, Apartment, GalleryAnnouncement
 from ads.services.initial_data_for_ads import create_data_for_ads
-from ads.services.update_data_for_ads import update_or_create_apartment
+from ads.services.update_data_for_ads import publish_announcement_events
+from ads.services.versions import bump_announcement_versions
 
 
 @receiver(post_save, sender=Announcement)
@@ -10,6 +11,30 @@ def post_save_announcement(created, **kwargs):
     instance = kwargs.get('instance')
     if created:
         create_data_for_ads(instance)
-    else:
-        update_or_create_apartment(instance)
+    publish_announcement_events(instance)
+    instance.remember_saved_state()
 
+
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+def announcement_changed(instance, **kwargs):
+    bump_announcement_versions([instance.id], [instance.residential_complex_id])
+
+
+@receiver(post_save, sender=Advertising)
+@receiver(post_delete, sender=Advertising)
+@receiver(post_save, sender=GalleryAnnouncement)
+@receiver(post_delete, sender=GalleryAnnouncement)
+def announcement_part_changed(instance, **kwargs):
+    bump_announcement_versions([instance.announcement_id])
+
+
+@receiver(post_save, sender=Apartment)
+@receiver(post_delete, sender=Apartment)
+def apartment_changed(instance, **kwargs):
+    # Apartments are also shown in the residential complex
+    try:
+        residential_complex_ids = [instance.announcement.residential_complex_id]
+    except Announcement.DoesNotExist:
+        residential_complex_ids = []
+    bump_announcement_versions([instance.announcement_id], residential_complex_ids)
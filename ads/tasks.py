@@ -1,21 +1,49 @@
-from django.core.mail import send_mail
+from django.db import transaction
 from .models import Advertising
-from datetime import datetime
+from .services.snapshots import publish_feed_snapshots as publish_snapshots
+from .services.versions import bump_announcement_versions
 from swipe.celery import app
+from swipe.expiry import expire_due
+from swipe.warming import warm_caches as warm_page_caches
+from sync.models import Change
+from sync.services.changes import record_changes
+from users.tasks import send_email
 
 
 @app.task
 def deactivate_announcement_advertising():
     """
-    Deactivate announcement advertising after the end date
+    Deactivate announcement advertising after the end date, runs every minute on the due advertising only
     """
-    print('task "deactivate_announcement_advertising" send')
-    advertising = Advertising.objects.filter(is_active=True, date_end__lt=datetime.now())
-    send_mail('SWIPE',
-              'Your advertising has expired',
-              None,
-              list(advertising.values_list('announcement__creator__email', flat=True)),
-              fail_silently=False
-              )
-    advertising.update(is_active=False)
-    print('task "deactivate_announcement_advertising" complete')
+    def deactivate(advertising):
+        emails = list(advertising.values_list('announcement__creator__email', flat=True))
+        announcement_ids = list(advertising.values_list('announcement_id', flat=True))
+        advertising.update(is_active=False)
+        bump_announcement_versions(announcement_ids)
+        record_changes(Change.Kind.ANNOUNCEMENT, announcement_ids)
+        # Mailed once the batch is committed, a failing mail server does not roll it back
+        transaction.on_commit(lambda: send_email.delay('SWIPE', 'Your advertising has expired', None, emails))
+
+    expired = expire_due(Advertising.objects.filter(is_active=True), deactivate)
+    if expired:
+        print(f'task "deactivate_announcement_advertising" complete, {expired} advertising')
+
+
+@app.task
+def warm_caches():
+    """
+    Fill the page caches after a deploy or a flush of Redis
+    """
+    print('task "warm_caches" send')
+    statuses = warm_page_caches()
+    print(f'task "warm_caches" complete, {len(statuses)} pages')
+
+
+@app.task
+def publish_feed_snapshots():
+    """
+    Re-render the static feed snapshots served by nginx when the feed changed
+    """
+    names = publish_snapshots()
+    if names:
+        print(f'task "publish_feed_snapshots" complete, {len(names)} snapshots')
@@ -0,0 +1,19 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class BaseTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(
+            email='admin@admin.com',
+            first_name='Test',
+            last_name='Test',
+        )
+        self.user.set_password('Zaqwerty123')
+        self.user.save()
+        self.client.force_authenticate(user=self.user)
@@ -1,34 +1,121 @@
-from django.contrib.auth import get_user_model
+import gzip
+from hashlib import sha1
+
+import brotli
+import msgpack
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import ListSerializer
 from rest_framework.test import APIClient, APITestCase
 
 # Create your tests here.
 from ads.models import Announcement
+from ads.serializers import (
+    AnnouncementListSerializer, AnnouncementModerationSerializer, ResidentialComplexListSerializer, ApartmentSerializer
+)
+from ads.tests.base import BaseTestCase
+from benchmarks.fixtures import build_fixtures
 
-User = get_user_model()
 client = APIClient()
 
 
-class BaseTestCase(APITestCase):
+class AnnouncementTestCase(BaseTestCase):
 
-    def setUp(self):
-        self.user = User.objects.create(
-            email='admin@admin.com',
-            first_name='Test',
-            last_name='Test',
-        )
-        self.user.set_password('Zaqwerty123')
-        self.user.save()
-        self.client.force_authenticate(user=self.user)
+    def test_get_announcement_list(self):
+        url = reverse('ads:announcement-feed-list')
+        response = self.client.get(url)
+        assert response.status_code == 200
 
+    def test_stream_announcement_list(self):
+        for price in [42000, 43000]:
+            Announcement.objects.create(
+                address='Адрес', description='Описание', area=54.5, area_kitchen=12, price=price,
+                creator=self.user
+            )
+        url = reverse('ads:announcement-feed-list')
+        response = self.client.get(url)
+        streamed = self.client.get(url, {'stream': 'true'})
+        assert streamed.status_code == 200
+        assert streamed.streaming
+        assert b''.join(streamed.streaming_content) == response.content
 
-class AnnouncementTestCase(BaseTestCase):
+    def test_announcement_list_sparse_fields(self):
+        for price in [42000, 43000]:
+            Announcement.objects.create(
+                address='Адрес', description='Описание', area=54.5, area_kitchen=12, price=price,
+                creator=self.user
+            )
+        url = reverse('ads:announcement-feed-list')
+        with CaptureQueriesContext(connection) as full:
+            self.client.get(url)
+        with CaptureQueriesContext(connection) as sparse:
+            response = self.client.get(url, {'fields': 'id,price,advertising.phrase', 'expand': 'creator'})
+        assert response.status_code == 200
+        assert len(sparse) < len(full)
+        announcement = response.json()['data'][0]
+        assert list(announcement) == ['id', 'price', 'advertising']
+        assert list(announcement['advertising']) == ['phrase']
 
-    def test_get_announcement_list(self):
+        response = self.client.get(url, {'fields': 'id,creator', 'expand': 'creator'})
+        assert response.json()['data'][0]['creator']['first_name'] == 'Test'
+
+        url = reverse('ads:announcement-feed-detail', args=[announcement['id']])
+        response = self.client.get(url, {'fields': 'id,description,creator.phone'})
+        assert response.json() == {'description': 'Описание', 'id': announcement['id'], 'creator': {'phone': ''}}
+
+    def test_announcement_list_not_modified(self):
         url = reverse('ads:announcement-feed-list')
         response = self.client.get(url)
+        etag = response['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Announcement.objects.create(
+                address='Адрес', description='Описание', area=54.5, area_kitchen=12, price=42000, creator=self.user
+            )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
         assert response.status_code == 200
+        assert response['ETag'] != etag
 
+    def test_announcement_list_compressed(self):
+        for price in range(42000, 42020):
+            Announcement.objects.create(
+                address='Адрес', description='Описание', area=54.5, area_kitchen=12, price=price, creator=self.user
+            )
+        url = reverse('ads:announcement-feed-list')
+        content = self.client.get(url).content
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        assert response['Content-Encoding'] == 'br'
+        assert response['ETag'].startswith('W/')
+        assert brotli.decompress(response.content) == content
+        assert cache.get(f'compressed:br:{sha1(content).hexdigest()}') == response.content
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert response['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.content) == content
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+
+    def test_get_announcement_list_msgpack(self):
+        Announcement.objects.create(
+            address='Адрес', description='Описание', area=54.5, area_kitchen=12, price=42000, creator=self.user
+        )
+        url = reverse('ads:announcement-feed-list')
+        response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/msgpack'
+        assert msgpack.unpackb(response.content) == self.client.get(url).json()
 
 
+class CompiledSerializerTestCase(APITestCase):
 
+    def test_compiled_list_matches_serializer(self):
+        fixtures = build_fixtures(3)
+        for serializer_class in [AnnouncementListSerializer, AnnouncementModerationSerializer,
+                                 ResidentialComplexListSerializer, ApartmentSerializer]:
+            instances = fixtures[serializer_class.Meta.model]
+            expected = ListSerializer(instances, child=serializer_class()).data
+            compiled = serializer_class(instances, many=True).data
+            assert JSONRenderer().render(compiled) == JSONRenderer().render(expected)
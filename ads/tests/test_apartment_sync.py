@@ -0,0 +1,51 @@
+from django.urls import reverse
+
+from ads.models import Advertising, Announcement, Apartment
+from ads.serializers import AnnouncementUpdateSerializer
+from ads.tests.base import BaseTestCase
+from swipe.celery import app
+from sync.services.events import relay_events
+
+
+class ApartmentSyncTestCase(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        app.conf.update(task_always_eager=True)
+        self.addCleanup(app.conf.update, task_always_eager=False)
+        self.user.is_staff = True
+        self.user.save()
+
+    def test_apartment_synced_from_events(self):
+        announcement = Announcement.objects.create(
+            address='Адрес', description='Описание', area=50, area_kitchen=12, price=40000,
+            creator=self.user, purpose='Квартира'
+        )
+        assert Advertising.objects.filter(announcement=announcement).exists()
+        url = reverse('ads:announcement-moderation-detail', args=[announcement.id])
+        response = self.client.put(url, data={'is_moderation_check': True})
+        assert response.status_code == 200
+        assert not Apartment.objects.filter(announcement=announcement).exists()
+        with self.captureOnCommitCallbacks(execute=True):
+            relay_events()
+        apartment = Apartment.objects.get(announcement=announcement)
+        assert (apartment.number, apartment.price_to_meter) == (announcement.id, 800)
+
+        announcement.refresh_from_db()
+        serializer = AnnouncementUpdateSerializer(
+            announcement, data={'price': 50000, 'area': 50, 'area_kitchen': 12}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            relay_events()
+        assert Apartment.objects.get(announcement=announcement).price_to_meter == 1000
+
+    def test_apartment_synced_for_announcement_created_moderated(self):
+        announcement = Announcement.objects.create(
+            address='Адрес', description='Описание', area=50, area_kitchen=12, price=40000,
+            creator=self.user, purpose='Квартира', is_moderation_check=True
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            relay_events()
+        assert Apartment.objects.get(announcement=announcement).price_to_meter == 800
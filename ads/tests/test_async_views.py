@@ -0,0 +1,73 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.handlers.base import BaseHandler
+from django.http import StreamingHttpResponse
+from django.test import AsyncRequestFactory, override_settings
+from django.urls import reverse
+from rest_framework.test import APITransactionTestCase, APIRequestFactory, force_authenticate
+
+from ads.models import Announcement
+from ads.views import AnnouncementListViewSet
+from ads.tests.urls import overlap
+from swipe.async_views import StreamingASGIHandler, async_view
+
+User = get_user_model()
+
+
+class AsyncViewTestCase(APITransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_async_feed_matches_sync(self):
+        user = User.objects.create(email='admin@admin.com', first_name='Test', last_name='Test')
+        Announcement.objects.create(
+            address='Адрес', description='Описание', area=54.5, area_kitchen=12, price=42000, creator=user
+        )
+        self.client.force_authenticate(user=user)
+        expected = self.client.get(reverse('ads:announcement-feed-list')).content
+
+        view = async_view(AnnouncementListViewSet.as_view({'get': 'list'}))
+        for params in [{}, {'stream': 'true'}]:
+            request = APIRequestFactory().get(reverse('ads:announcement-feed-list'), params)
+            force_authenticate(request, user=user)
+            response = async_to_sync(view)(request)
+            assert response.status_code == 200
+            content = b''.join(response.streaming_content) if response.streaming else response.content
+            assert content == expected
+
+    def test_streamed_body_read_in_a_thread(self):
+        User.objects.create(email='admin@admin.com', first_name='Test', last_name='Test')
+
+        def parts():
+            # The ORM raises SynchronousOnlyOperation on the event loop
+            yield b'['
+            yield str(User.objects.count()).encode()
+            yield b']'
+
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        async_to_sync(StreamingASGIHandler().send_response)(StreamingHttpResponse(parts()), send)
+        assert messages[0]['type'] == 'http.response.start'
+        assert b''.join(message.get('body', b'') for message in messages[1:]) == b'[1]'
+        assert messages[-1] == {'type': 'http.response.body'}
+
+    @override_settings(ROOT_URLCONF='ads.tests.urls')
+    def test_async_views_overlap_through_middleware(self):
+        overlap.reset()
+        handler = BaseHandler()
+        handler.load_middleware(is_async=True)
+
+        async def get_all():
+            requests = [AsyncRequestFactory().get('/overlap/') for _ in range(4)]
+            return await asyncio.gather(*[handler.get_response_async(request) for request in requests])
+
+        # A thread-sensitive middleware would run the views one after another and break the barrier
+        responses = async_to_sync(get_all)()
+        assert [response.status_code for response in responses] == [200] * 4
@@ -0,0 +1,72 @@
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from swipe import coalescing
+from swipe.caching import _refresh, stale_while_revalidate
+from swipe.coalescing import single_flight
+
+
+class SingleFlightTestCase(APITestCase):
+
+    def test_concurrent_calls_share_computation(self):
+        waiting = threading.Semaphore(0)
+
+        class WatchedFlight(coalescing._Flight):
+            def __init__(self):
+                super().__init__()
+                wait = self.done.wait
+
+                def wait_counted(timeout=None):
+                    waiting.release()
+                    return wait(timeout)
+
+                self.done.wait = wait_counted
+
+        calls = []
+
+        def compute():
+            calls.append(1)
+            # The other four calls wait for this one before it finishes
+            for _ in range(4):
+                assert waiting.acquire(timeout=5)
+            return [42]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(single_flight('feed-page', compute))) for _ in range(5)
+        ]
+        with mock.patch('swipe.coalescing._Flight', WatchedFlight):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert results == [[42]] * 5
+        assert len(calls) == 1
+
+
+class StaleWhileRevalidateTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_stale_entry_served_while_refreshed(self):
+        assert stale_while_revalidate('page:test', lambda: 'first', [1]) == 'first'
+        assert stale_while_revalidate('page:test', lambda: 'second', [1]) == 'first'
+        # A new version is never served stale
+        assert stale_while_revalidate('page:test', lambda: 'second', [2]) == 'second'
+
+        value, stamps, expires_at, delta = cache.get('page:test')
+        cache.set('page:test', (value, stamps, expires_at - 3600, delta))
+        refreshed = threading.Event()
+
+        def refresh(*args):
+            _refresh(*args)
+            refreshed.set()
+
+        with mock.patch('swipe.caching._refresh', refresh):
+            assert stale_while_revalidate('page:test', lambda: 'third', [2]) == 'second'
+            assert refreshed.wait(timeout=5)
+        assert stale_while_revalidate('page:test', lambda: 'fourth', [2]) == 'third'
@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.core import mail
+from django.utils import timezone
+
+from ads.models import Advertising, Announcement
+from ads.tasks import deactivate_announcement_advertising
+from ads.tests.base import BaseTestCase
+from swipe.celery import app
+from swipe.expiry import expire_due
+
+
+class AdvertisingExpiryTestCase(BaseTestCase):
+
+    def create_advertising(self, date_end):
+        announcement = Announcement.objects.create(
+            address='Адрес', description='Описание', area=54.5, area_kitchen=12, price=42000, creator=self.user
+        )
+        Advertising.objects.filter(announcement=announcement).update(is_active=True, date_end=date_end)
+        return Advertising.objects.get(announcement=announcement)
+
+    def test_due_advertising_expires_in_batches(self):
+        today = timezone.localdate()
+        due = [self.create_advertising(today - timedelta(days=1)) for _ in range(3)]
+        current = self.create_advertising(today)
+
+        batches = []
+        expired = expire_due(
+            Advertising.objects.filter(is_active=True),
+            lambda advertising: batches.append(advertising.update(is_active=False)), batch_size=2
+        )
+        assert (expired, batches) == (3, [2, 1])
+        assert not Advertising.objects.filter(id__in=[advertising.id for advertising in due], is_active=True).exists()
+        assert Advertising.objects.get(id=current.id).is_active
+
+    def test_deactivate_announcement_advertising(self):
+        advertising = self.create_advertising(timezone.localdate() - timedelta(days=1))
+        app.conf.update(task_always_eager=True)
+        self.addCleanup(app.conf.update, task_always_eager=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            deactivate_announcement_advertising()
+        assert not Advertising.objects.get(id=advertising.id).is_active
+        assert [message.to for message in mail.outbox] == [[self.user.email]]
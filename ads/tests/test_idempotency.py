@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from ads.models import Announcement, Complaint
+from ads.tests.base import BaseTestCase
+from swipe.idempotency import idempotency_cache_key, request_fingerprint
+
+
+class IdempotencyTestCase(BaseTestCase):
+
+    def test_retried_create_is_replayed(self):
+        announcement = Announcement.objects.create(
+            address='Адрес', description='Описание', area=54.5, area_kitchen=12, price=42000, creator=self.user,
+            purpose='Квартира'
+        )
+        url = reverse('ads:announcement-complaint-list')
+        data = {'announcement': announcement.id}
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='complaint-1')
+        retry = self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='complaint-1')
+        assert first.status_code == retry.status_code == 201
+        assert retry.json() == first.json()
+        assert retry['Idempotent-Replayed'] == 'true'
+        assert Complaint.objects.filter(announcement=announcement).count() == 1
+
+        assert self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='complaint-2').status_code == 400
+        assert self.client.post(url, data, format='json').status_code == 400
+
+        other = {'announcement': announcement.id + 1}
+        assert self.client.post(url, other, format='json', HTTP_IDEMPOTENCY_KEY='complaint-1').status_code == 422
+
+    def test_idempotency_key_in_progress_or_rolled_back(self):
+        announcement = Announcement.objects.create(
+            address='Адрес', description='Описание', area=54.5, area_kitchen=12, price=42000, creator=self.user,
+            purpose='Квартира'
+        )
+        url = reverse('ads:announcement-complaint-list')
+        data = {'announcement': announcement.id}
+        cache_key = idempotency_cache_key(SimpleNamespace(user=self.user, path=url), 'complaint-1')
+        cache.set(cache_key, (request_fingerprint(SimpleNamespace(data=data)), 'pending'))
+        assert self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='complaint-1').status_code == 409
+
+        cache.delete(cache_key)
+        # The transaction of the test case never commits: the key is freed once the response is closed
+        assert self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='complaint-1').status_code == 201
+        assert cache.get(cache_key) is None
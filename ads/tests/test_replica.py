@@ -0,0 +1,75 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import resolve, reverse
+
+from ads.models import Announcement
+from ads.tests.base import BaseTestCase
+from swipe.middleware import ReplicaMiddleware
+from swipe.routers import ReplicaRouter, read_from_primary
+
+User = get_user_model()
+
+
+@override_settings(DATABASES={**settings.DATABASES, 'replica': settings.DATABASES['default']})
+class ReplicaRouterTestCase(BaseTestCase):
+
+    def read_database(self, method, path, user=None):
+        databases = []
+
+        def view(request):
+            databases.append(ReplicaRouter().db_for_read(Announcement))
+            request.user = user
+            databases.append(ReplicaRouter().db_for_read(Announcement))
+            with read_from_primary():
+                databases.append(ReplicaRouter().db_for_read(Announcement))
+            return HttpResponse(status=201 if method == 'post' else 200)
+
+        request = getattr(RequestFactory(), method)(path)
+        middleware = ReplicaMiddleware(view)
+        middleware.process_view(request, resolve(path).func, (), {})
+        middleware(request)
+        return databases
+
+    def test_reads_routed_to_replica(self):
+        feed_url = reverse('ads:announcement-feed-list')
+        assert self.read_database('get', feed_url, self.user) == [None, 'replica', None]
+        assert self.read_database('get', reverse('ads:announcement-favorites-get'), self.user)[1] == 'replica'
+        assert self.read_database('get', reverse('ads:announcement-moderation-list'), self.user)[1] == 'replica'
+        assert self.read_database('get', reverse('users:success-email-verify'), self.user)[1] is None
+
+        self.read_database('post', reverse('ads:announcement-complaint-list'), self.user)
+        assert self.read_database('get', feed_url, self.user)[1] is None
+        assert self.read_database('get', feed_url, User.objects.create(email='other@admin.com'))[1] == 'replica'
+
+    def test_versioned_views_read_primary_while_replica_lags(self):
+        announcement = Announcement.objects.create(
+            address='Адрес', description='Описание', area=54.5, area_kitchen=12, price=42000, creator=self.user
+        )
+        url = reverse('ads:announcement-feed-detail', args=[announcement.id])
+        db_for_read = ReplicaRouter.db_for_read
+
+        def read_databases(now):
+            databases = []
+
+            def spy(router, model, **hints):
+                databases.append(db_for_read(router, model, **hints))
+                # The connections were set up without the replica, the queries run on the primary
+                return None
+
+            with mock.patch.object(ReplicaRouter, 'db_for_read', spy), \
+                    mock.patch('swipe.versioning.time_ns', return_value=now):
+                assert self.client.get(url).status_code == 200
+            return databases
+
+        self.client.force_authenticate(user=self.user)
+        now = time.time_ns()
+        # Fresh stamps: the object the permission check loaded from the replica is read again from the primary
+        databases = read_databases(now)
+        assert databases[0] == 'replica' and databases[-1] is None
+        # The stamps are older than the replication lag: the replica serves the whole request
+        assert set(read_databases(now + 3600 * 10 ** 9)) == {'replica'}
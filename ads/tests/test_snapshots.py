@@ -0,0 +1,39 @@
+import gzip
+import json
+import os
+import tempfile
+
+from django.test import override_settings
+from django.urls import reverse
+
+from ads.models import Announcement
+from ads.services.snapshots import publish_feed_snapshots, snapshot_dir
+from ads.tests.base import BaseTestCase
+
+
+class FeedSnapshotTestCase(BaseTestCase):
+
+    def test_publish_feed_snapshots(self):
+        announcement = Announcement.objects.create(
+            address='Адрес', description='Описание', area=54.5, area_kitchen=12, price=42000, creator=self.user,
+            purpose='Квартира'
+        )
+        self.user.favorites_announcement.add(announcement)
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            names = publish_feed_snapshots()
+            assert 'default' in names and 'purpose-flat' in names
+            assert publish_feed_snapshots() == []
+
+            for name, params in [('default', {}), ('purpose-flat', {'purpose': 'Квартира'}), ('rooms-3', {'rooms': 3})]:
+                path = os.path.join(snapshot_dir(), f'{name}.json')
+                with open(path, 'rb') as file:
+                    content = file.read()
+                with open(f'{path}.gz', 'rb') as file:
+                    assert gzip.decompress(file.read()) == content
+                response = self.client.get(reverse('ads:announcement-feed-list'), params)
+                data = response.json()['data']
+                for row in data:
+                    row.pop('favorite_announcement', None)
+                    row.pop('favorite_complex', None)
+                assert json.loads(content)['data'] == data
+                assert b'favorite' not in content
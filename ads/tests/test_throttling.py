@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+
+from ads.tests.base import BaseTestCase
+from swipe.throttling import TokenBucketThrottle, buckets
+
+User = get_user_model()
+
+
+@override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'favorites': '2/min'}})
+class ThrottleTestCase(BaseTestCase):
+
+    def test_favorites_throttled_per_user(self):
+        url = reverse('ads:announcement-favorites-delete') + '?announcement_id=0'
+        assert [self.client.delete(url).status_code for _ in range(3)] == [400, 400, 429]
+        assert self.client.get(reverse('ads:announcement-favorites-get')).status_code == 200
+
+        self.client.force_authenticate(user=User.objects.create(email='other@admin.com'))
+        response = self.client.delete(url)
+        assert response.status_code == 400
+
+    def test_token_bucket_refill(self):
+        with mock.patch('swipe.throttling.time', return_value=1000.0) as clock:
+            for _ in range(10):
+                assert buckets.take('throttle:test', 10, 1) == 0
+            assert buckets.take('throttle:test', 10, 1) == 1
+            clock.return_value += 0.5
+            assert buckets.take('throttle:test', 10, 1) == 0.5
+            clock.return_value += 0.5
+            assert buckets.take('throttle:test', 10, 1) == 0
+
+    def test_scope_without_rate_not_throttled(self):
+        view = SimpleNamespace(action='create', throttle_scopes={'create': 'unknown'})
+        request = SimpleNamespace(user=self.user, META={'REMOTE_ADDR': '127.0.0.1'})
+        assert TokenBucketThrottle().allow_request(request, view)
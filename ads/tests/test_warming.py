@@ -0,0 +1,50 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from sync.models import PopularPage
+
+User = get_user_model()
+
+
+class WarmCachesTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_warm_caches(self):
+        User.objects.create(email='admin@admin.com', first_name='Test', last_name='Test', is_superuser=True)
+        developer = User.objects.create(email='builder@builder.com', first_name='Test', last_name='Test',
+                                        is_developer=True)
+        out = StringIO()
+        call_command('warm_caches', base_url='http://testserver', workers=1, stdout=out)
+        complex_url = reverse('housing:residential-complex-detail', args=[developer.user_residential_complex.id])
+        assert out.getvalue().splitlines() == [
+            f'200 http://testserver{reverse("ads:announcement-feed-list")}',
+            f'200 http://testserver{complex_url}',
+            f'200 http://testserver{reverse("users:notary-list")}',
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            self.client.force_authenticate(user=developer)
+            response = self.client.get(complex_url)
+        assert response.status_code == 200
+        assert not any('housing_residentialcomplex' in query['sql'] for query in queries.captured_queries)
+
+    @override_settings(WARM_CACHES_BASE_URL='http://testserver')
+    def test_warm_caches_after_flush(self):
+        User.objects.create(email='admin@admin.com', first_name='Test', last_name='Test', is_superuser=True)
+        feed_url = f'http://testserver{reverse("ads:announcement-feed-list")}?page=2'
+        PopularPage.objects.create(name='feed', uri=feed_url, score=3)
+        out = StringIO()
+        call_command('warm_caches', workers=1, stdout=out)
+        assert out.getvalue().splitlines() == [
+            f'200 {feed_url}', f'200 http://testserver{reverse("users:notary-list")}'
+        ]
+        assert PopularPage.objects.filter(name='feed', uri=feed_url).exists()
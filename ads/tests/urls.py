@@ -0,0 +1,17 @@
+import threading
+
+from django.http import HttpResponse
+from django.urls import path
+
+from swipe.async_views import async_view
+
+# The views only pass the barrier when the four requests run at the same time
+overlap = threading.Barrier(4)
+
+
+def overlapping_view(request):
+    overlap.wait(timeout=5)
+    return HttpResponse('overlapped')
+
+
+urlpatterns = [path('overlap/', async_view(overlapping_view))]
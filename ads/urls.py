@@ -1,5 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from swipe.async_views import async_routes
 from ads.views import (
     AnnouncementViewSet, AnnouncementComplaintViewSet,
     AnnouncementAdvertisingViewSet, FavoritesAnnouncementViewSet,
@@ -18,5 +19,7 @@ router.register('announcement-favorites', FavoritesAnnouncementViewSet, basename
 router.register('announcement-moderation', AnnouncementModerationViewSet, basename='announcement-moderation')
 
 urlpatterns = [
-    path('', include(router.urls))
+    path('', include(async_routes(router.urls, [
+        'announcement-feed-list', 'announcement-feed-detail', 'announcement-favorites-get'
+    ])))
 ]
@@ -1,3 +1,5 @@
+from itertools import chain
+
 from django.contrib.auth import get_user_model
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_psq import PsqMixin, Rule
@@ -10,10 +12,19 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 from housing.models import ResidentialComplex
+from swipe.mixins import SparseFieldsMixin, StreamingListMixin, STREAM_PARAMETER
+from swipe.parsers import MessagePackParser
+from swipe.authentication import ClaimsJWTAuthentication
+from swipe.caching import cached_page_data
+from swipe.idempotency import IdempotentCreateMixin
+from swipe.versioning import versioned
 from users.models import Filter
 from users.serializers import FilterSerializer
 from .filters import AnnouncementFilter, ApartmentFilter
 from .permissions import IsMyAnnouncement, IsMyAdvertising, IsMyApartment
+from .services.versions import (
+    feed_version_keys, feed_data_version_keys, announcement_version_keys, favorites_announcement_version_keys
+)
 from .serializers import (
     AnnouncementSerializer, AnnouncementUpdateSerializer, AnnouncementComplaintSerializer,
     AnnouncementAdvertisingSerializer, AnnouncementModerationSerializer,
@@ -34,11 +45,14 @@ User = get_user_model()
     description='Ad feed with filtering and getting a specific announcement. Permission: IsAuthenticated'
 )
 class AnnouncementListViewSet(PsqMixin,
+                              SparseFieldsMixin,
+                              StreamingListMixin,
                               mixins.RetrieveModelMixin,
                               mixins.ListModelMixin,
                               GenericViewSet):
     serializer_class = AnnouncementListSerializer
     permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
     filter_backends = [DjangoFilterBackend]
     filterset_class = AnnouncementFilter
     queryset = Announcement.objects.all()
@@ -52,6 +66,8 @@ class AnnouncementListViewSet(PsqMixin,
             'creator', 'residential_complex', 'advertising', 'announcement_apartment'
         ).prefetch_related('favorite_announcement', 'gallery_announcement').order_by('id')
 
+    @extend_schema(parameters=[STREAM_PARAMETER])
+    @versioned(feed_version_keys)
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         residential_complex_queryset = (
@@ -59,26 +75,44 @@ class AnnouncementListViewSet(PsqMixin,
                 'gallery_residential_complex', 'favorite_complex'
             )
         )
-        residential_complex_serializer = ResidentialComplexListSerializer(
-            residential_complex_queryset, many=True
+        residential_complex_serializer = self.get_sparse_serializer(
+            ResidentialComplexListSerializer, residential_complex_queryset, many=True
         )
         serializer = self.get_serializer(queryset, many=True)
+        filters = FilterSerializer(
+            Filter.objects.filter(user_id=request.user.pk), many=True, read_only=True
+        ).data
+        if self.is_streaming():
+            return self.get_streaming_response({
+                'data': chain(
+                    self.iter_rows(serializer, queryset),
+                    residential_complex_serializer.iter_representation(residential_complex_serializer.instance)
+                ),
+                'filters': filters
+            })
+        # The filters of the user are not part of the shared data
+        data = cached_page_data(
+            self, 'feed', lambda: serializer.data + residential_complex_serializer.data,
+            self.version_stamps[:len(feed_data_version_keys())]
+        )
         return Response({
-            'data': serializer.data + residential_complex_serializer.data,
-            'filters': FilterSerializer(
-                Filter.objects.filter(user=request.user), many=True, read_only=True
-            ).data
+            'data': data,
+            'filters': filters
         },
             status=status.HTTP_200_OK
         )
 
+    @versioned(announcement_version_keys)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(description='Get my announcements, Permission: IsAuthenticated', methods=["GET"])
     @action(detail=False, serializer_class=AnnouncementRetrieveSerializer)
     def get_my_announcement(self, request):
-        queryset = Announcement.objects.filter(creator=request.user).select_related(
+        queryset = Announcement.objects.filter(creator_id=request.user.pk).select_related(
             'creator', 'residential_complex', 'advertising', 'announcement_apartment'
         ).prefetch_related('favorite_announcement', 'gallery_announcement').order_by('id')
-        serializer = self.serializer_class(queryset, many=True)
+        serializer = self.get_sparse_serializer(self.serializer_class, queryset, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -86,7 +120,8 @@ class AnnouncementListViewSet(PsqMixin,
 @extend_schema(methods=['POST'], description='Create new announcement. Permissions: IsAuthenticated')
 @extend_schema(methods=['PUT'], description='Update a announcement. Permissions: [IsMyAnnouncement, IsAdminUser]')
 @extend_schema(methods=['DELETE'], description='Delete announcement. Permissions: [IsMyAnnouncement, IsAdminUser]')
-class AnnouncementViewSet(PsqMixin,
+class AnnouncementViewSet(IdempotentCreateMixin,
+                          PsqMixin,
                           mixins.CreateModelMixin,
                           mixins.UpdateModelMixin,
                           mixins.DestroyModelMixin,
@@ -122,9 +157,12 @@ class AnnouncementViewSet(PsqMixin,
 
 
 @extend_schema(tags=['announcement-moderation'])
-@extend_schema(methods=['GET'], description='Get announcement for moderations. Permissions: IsAdminUser')
+@extend_schema(methods=['GET'], description='Get announcement for moderations. Permissions: IsAdminUser',
+               parameters=[STREAM_PARAMETER])
 @extend_schema(methods=['PUT'], description='Moderation a announcement. Permissions: IsAdminUser')
-class AnnouncementModerationViewSet(mixins.UpdateModelMixin,
+class AnnouncementModerationViewSet(SparseFieldsMixin,
+                                    StreamingListMixin,
+                                    mixins.UpdateModelMixin,
                                     mixins.ListModelMixin,
                                     GenericViewSet):
     serializer_class = AnnouncementModerationSerializer
@@ -140,7 +178,9 @@ class AnnouncementModerationViewSet(mixins.UpdateModelMixin,
 @extend_schema(tags=['announcement-complaint'], description='Management a complaints on announcement')
 @extend_schema(methods=['POST'], description='Permissions: IsAuthenticated')
 @extend_schema(methods=['GET', 'DELETE'], description='Permissions: IsAdminUser')
-class AnnouncementComplaintViewSet(PsqMixin,
+class AnnouncementComplaintViewSet(IdempotentCreateMixin,
+                                   PsqMixin,
+                                   SparseFieldsMixin,
                                    mixins.CreateModelMixin,
                                    mixins.RetrieveModelMixin,
                                    mixins.DestroyModelMixin,
@@ -149,8 +189,9 @@ class AnnouncementComplaintViewSet(PsqMixin,
     queryset = Complaint.objects.all()
     serializer_class = AnnouncementComplaintSerializer
     permission_classes = [IsAdminUser]
-    parser_classes = [JSONParser]
+    parser_classes = [JSONParser, MessagePackParser]
     http_method_names = ['get', 'post', 'retrieve', 'delete']
+    throttle_scopes = {'create': 'complaint'}
 
     psq_rules = {
         ('create',): [
@@ -180,13 +221,14 @@ class AnnouncementComplaintViewSet(PsqMixin,
     description='Management a adveresting for announcement. Permissions: [IsAdminUser, IsMyAdvertising]'
 )
 class AnnouncementAdvertisingViewSet(PsqMixin,
+                                     SparseFieldsMixin,
                                      mixins.RetrieveModelMixin,
                                      mixins.UpdateModelMixin,
                                      GenericViewSet):
-    queryset = Advertising.objects.all()
+    queryset = Advertising.objects.select_related('announcement')
     serializer_class = AnnouncementAdvertisingSerializer
     permission_classes = [IsAdminUser]
-    parser_classes = [JSONParser]
+    parser_classes = [JSONParser, MessagePackParser]
     http_method_names = ['get', 'put', 'retrieve']
 
     psq_rules = {
@@ -211,16 +253,20 @@ class AnnouncementAdvertisingViewSet(PsqMixin,
         )
     ]
 )
-class FavoritesAnnouncementViewSet(mixins.CreateModelMixin,
+class FavoritesAnnouncementViewSet(SparseFieldsMixin,
+                                   mixins.CreateModelMixin,
                                    GenericViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = UserFavoritesAnnouncementSerializer
     queryset = User.objects.all()
+    throttle_scopes = {'create': 'favorites', 'delete': 'favorites'}
+    replica_actions = ['get']
 
     @extend_schema(description='Get favorites apartments, Permissions: IsAuthenticated', methods=["GET"])
     @action(detail=False)
+    @versioned(favorites_announcement_version_keys)
     def get(self, request):
-        serializer = self.serializer_class(request.user)
+        serializer = self.get_sparse_serializer(self.serializer_class, request.user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def create(self, request, *args, **kwargs):
@@ -267,6 +313,7 @@ class FavoritesAnnouncementViewSet(mixins.CreateModelMixin,
     description='Update and add in in residential complex. Permissions: [IsMyApartment, IsAdminUser]'
 )
 class ApartmentViewSet(PsqMixin,
+                       SparseFieldsMixin,
                        mixins.RetrieveModelMixin,
                        mixins.UpdateModelMixin,
                        mixins.ListModelMixin,
@@ -303,6 +350,6 @@ class ApartmentViewSet(PsqMixin,
         if announcement__residential_complex:
             queryset = Apartment.objects.filter(
                 announcement__residential_complex=announcement__residential_complex
-            )
+            ).select_related('announcement')
             return queryset
-        return Apartment.objects.all()
+        return Apartment.objects.select_related('announcement')
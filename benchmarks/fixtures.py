@@ -0,0 +1,175 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from ads.models import Announcement, Advertising, Apartment, GalleryAnnouncement, Complaint
+from housing.models import (
+    ResidentialComplex, ResidentialComplexBenefits, RegistrationAndPayment,
+    ResidentialComplexNews, GalleryResidentialComplex, Document
+)
+from users.models import Subscription, Contact, Notary, Message, MessageFile, Filter
+
+User = get_user_model()
+
+RELATED_COUNT = 3
+
+
+def prefetch(instance, name, objects):
+    """
+    Fill the prefetch cache of the related manager ``name`` as prefetch_related() would
+    """
+    if not hasattr(instance, '_prefetched_objects_cache'):
+        instance._prefetched_objects_cache = {}
+    manager = getattr(instance, name)
+    cache_name = getattr(manager, 'prefetch_cache_name', None) or manager.field.remote_field.get_cache_name()
+    queryset = manager.get_queryset()
+    queryset._result_cache = list(objects)
+    queryset._prefetch_done = True
+    instance._prefetched_objects_cache[cache_name] = queryset
+
+
+def build_users(count):
+    return [
+        User(
+            id=pk, email=f'user{pk}@example.com', first_name='Имя', last_name='Фамилия',
+            phone='+380939804334', profile_image='images/user/profile/sample.png',
+            is_blacklist=False, per_agent=False, notification=User.Notification.ME,
+            date_joined=timezone.now()
+        )
+        for pk in range(1, count + 1)
+    ]
+
+
+def build_residential_complex(pk, user):
+    complex_ = ResidentialComplex(
+        id=pk, name='Название', description='Описание ЖК', commissioning_date=date.today(),
+        address='Адрес', map_lat=Decimal('46.5021844598406200'), map_lon=Decimal('30.7383512067256320'),
+        distance=2500, ceiling_height=2.5, corpus=4, section=2, floor=16, riser=8
+    )
+    complex_.user = user
+    complex_.benefits = ResidentialComplexBenefits(id=pk, playground=True)
+    complex_.registration_and_payment = RegistrationAndPayment(
+        id=pk, formalization='Юстиция', payment_options='Ипотека',
+        purpose='Жилое помещение', contract_sum='Неполная'
+    )
+    complex_.sales_department_contact = Contact(
+        id=pk, first_name='Юля', last_name='Тест', phone='+380955554433',
+        email='sales@example.com', type=Contact.TYPES.SALES_DEPARTMENT
+    )
+    prefetch(complex_, 'news', [
+        ResidentialComplexNews(
+            id=pk * RELATED_COUNT + i, title='Новость', text='Текст новости',
+            date_created=date.today(), residential_complex=complex_
+        )
+        for i in range(RELATED_COUNT)
+    ])
+    prefetch(complex_, 'document', [
+        Document(
+            id=pk * RELATED_COUNT + i, name='Документ', file='files/housing/document/sample.pdf',
+            residential_complex=complex_
+        )
+        for i in range(RELATED_COUNT)
+    ])
+    prefetch(complex_, 'gallery_residential_complex', [
+        GalleryResidentialComplex(
+            id=pk * RELATED_COUNT + i, image='images/housing/gallery/complex/sample.jpg',
+            order=i, residential_complex=complex_
+        )
+        for i in range(RELATED_COUNT)
+    ])
+    return complex_
+
+
+def build_announcement(pk, creator, residential_complex):
+    announcement = Announcement(
+        id=pk, address='Адрес', description='Тестовое объявление', area=Decimal('54.5'),
+        area_kitchen=Decimal('12.0'), price=42000, date_created=timezone.now(),
+        is_moderation_check=True
+    )
+    announcement.creator = creator
+    announcement.residential_complex = residential_complex
+    announcement.advertising = Advertising(
+        id=pk, phrase=Advertising.AdvertisingPhrase.PHRASE2, color=Advertising.AdvertisingColor.PINK,
+        date_start=date.today()
+    )
+    announcement.announcement_apartment = Apartment(
+        id=pk, number=pk, price_to_meter=771, plan='images/housing/apartment/plan/sample.png',
+        plan_floor='images/housing/apartment/plan_floor/sample.jpg'
+    )
+    prefetch(announcement, 'gallery_announcement', [
+        GalleryAnnouncement(
+            id=pk * RELATED_COUNT + i, image='images/ads/gallery/announcements/sample.jpg',
+            announcement=announcement
+        )
+        for i in range(RELATED_COUNT)
+    ])
+    return announcement
+
+
+def build_fixtures(count):
+    """
+    Build ``count`` unsaved instances of every model used by the serializers with all
+    relations attached to the instances, so serialization never touches the database
+    """
+    users = build_users(count)
+    complexes = [build_residential_complex(pk, user) for pk, user in enumerate(users, start=1)]
+    announcements = [
+        build_announcement(pk, user, complex_)
+        for pk, (user, complex_) in enumerate(zip(users, complexes), start=1)
+    ]
+    favorite_users = users[:RELATED_COUNT]
+    for user in users:
+        prefetch(user, 'favorites_announcement', announcements[:RELATED_COUNT])
+        prefetch(user, 'favorites_residential_complex', complexes[:RELATED_COUNT])
+    for announcement in announcements:
+        prefetch(announcement, 'favorite_announcement', favorite_users)
+    for pk, complex_ in enumerate(complexes):
+        prefetch(complex_, 'favorite_complex', favorite_users)
+        prefetch(complex_, 'residential_complex_announcement', announcements[pk:pk + RELATED_COUNT])
+
+    messages = []
+    for pk, user in enumerate(users, start=1):
+        message = Message(id=pk, text='Сообщение', sender=user, recipient=users[-pk])
+        prefetch(message, 'message_files', [
+            MessageFile(id=pk * RELATED_COUNT + i, file='files/user/message/sample.pdf', message=message)
+            for i in range(RELATED_COUNT)
+        ])
+        messages.append(message)
+
+    return {
+        User: users,
+        ResidentialComplex: complexes,
+        Announcement: announcements,
+        Apartment: [announcement.announcement_apartment for announcement in announcements],
+        Advertising: [announcement.advertising for announcement in announcements],
+        GalleryAnnouncement: [announcement.gallery_announcement.all()[0] for announcement in announcements],
+        Complaint: [
+            Complaint(id=pk, date_created=timezone.now(), announcement=announcement, creator=announcement.creator)
+            for pk, announcement in enumerate(announcements, start=1)
+        ],
+        ResidentialComplexBenefits: [complex_.benefits for complex_ in complexes],
+        RegistrationAndPayment: [complex_.registration_and_payment for complex_ in complexes],
+        ResidentialComplexNews: [complex_.news.all()[0] for complex_ in complexes],
+        Document: [complex_.document.all()[0] for complex_ in complexes],
+        GalleryResidentialComplex: [complex_.gallery_residential_complex.all()[0] for complex_ in complexes],
+        Contact: [complex_.sales_department_contact for complex_ in complexes],
+        Subscription: [
+            Subscription(id=pk, date_start=date.today(), date_end=date.today(), user=user)
+            for pk, user in enumerate(users, start=1)
+        ],
+        Notary: [
+            Notary(
+                id=pk, first_name='Имя', last_name='Фамилия', phone='+380933252525',
+                email=f'notary{pk}@example.com', profile_image='images/user/notary/sample.jpg'
+            )
+            for pk in range(1, count + 1)
+        ],
+        Message: messages,
+        MessageFile: [message.message_files.all()[0] for message in messages],
+        Filter: [
+            Filter(id=pk, rooms=2, price_start=20000, price_end=40000, type_housing=Filter.TypeFilter.ALL, user=user)
+            for pk, user in enumerate(users, start=1)
+        ],
+    }
@@ -0,0 +1,71 @@
+import gc
+import inspect
+import statistics
+import tracemalloc
+from contextlib import contextmanager, ExitStack
+from time import perf_counter
+
+from django.db import connections
+from rest_framework import serializers
+
+
+class QueryAttempted(RuntimeError):
+    pass
+
+
+def _block_queries(execute, sql, params, many, context):
+    raise QueryAttempted(f'Benchmark tried to query the database: {sql}')
+
+
+@contextmanager
+def no_queries():
+    """
+    Fail loudly if the benchmarked code touches any database connection
+    """
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(_block_queries))
+        yield
+
+
+def model_serializers(module):
+    """
+    Return ModelSerializer classes declared in ``module`` in declaration order
+    """
+    classes = [
+        cls for _, cls in inspect.getmembers(module, inspect.isclass)
+        if issubclass(cls, serializers.ModelSerializer) and cls.__module__ == module.__name__
+    ]
+    return sorted(classes, key=lambda cls: inspect.getsourcelines(cls)[1])
+
+
+def measure(func, count, repeat):
+    """
+    Time ``func`` which processes ``count`` objects and trace its memory allocations.
+    Returns per-object figures: best and median time in microseconds,
+    peak traced memory in bytes and the number of memory blocks left allocated
+    """
+    func()
+    gc.collect()
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        timings.append(perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    del result
+
+    return {
+        'best_us': min(timings) / count * 1e6,
+        'median_us': statistics.median(timings) / count * 1e6,
+        'peak_bytes': peak / count,
+        'blocks': blocks / count,
+    }
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from benchmarks.harness import measure
+
+
+class Command(BaseCommand):
+    help = 'Time the database work of a request cycle with a new connection per request and with persistent ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias')
+        parser.add_argument('--count', type=int, default=200, help='Requests per run')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per mode')
+        parser.add_argument('--max-age', type=int, default=60, help='CONN_MAX_AGE of the persistent mode')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        count, repeat = options['count'], options['repeat']
+        connects = []
+
+        def count_connect(sender, connection, **kwargs):
+            if connection.alias == options['database']:
+                connects.append(1)
+
+        def request_cycle():
+            for _ in range(count):
+                # The signals around a request are what opens and closes connections in Django
+                request_started.send(sender=self.__class__)
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                request_finished.send(sender=self.__class__)
+
+        self.stdout.write(f'{"mode":<12} {"best us/req":>12} {"median us/req":>14} {"connects/req":>13}')
+        results = {}
+        max_age = connection.settings_dict['CONN_MAX_AGE']
+        connection_created.connect(count_connect)
+        try:
+            for name, age in [('per-request', 0), ('persistent', options['max_age'])]:
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = age
+                connects.clear()
+                result = results[name] = measure(request_cycle, count, repeat)
+                # measure() runs the cycle once to warm up, ``repeat`` times timed and once traced
+                churn = len(connects) / (count * (repeat + 2))
+                self.stdout.write(f'{name:<12} {result["best_us"]:>12.1f} {result["median_us"]:>14.1f} {churn:>13.3f}')
+        finally:
+            connection_created.disconnect(count_connect)
+            connection.settings_dict['CONN_MAX_AGE'] = max_age
+            connection.close()
+        saved = results['per-request']['best_us'] - results['persistent']['best_us']
+        self.stdout.write(f'saved {saved:.1f} us/req ({saved / results["per-request"]["best_us"]:.0%})')
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory, override_settings
+from django.utils.module_loading import import_string
+
+from benchmarks.harness import measure
+from swipe.middleware import HTMLOnlyMixin
+
+DEBUG_TOOLBAR_MIDDLEWARE = 'debug_toolbar.middleware.DebugToolbarMiddleware'
+
+
+def full_middleware():
+    """
+    MIDDLEWARE as it was before the HTML-only split: every request runs the Django classes of the
+    HTML middleware and the debug toolbar
+    """
+    middleware = []
+    for path in settings.MIDDLEWARE:
+        middleware_class = import_string(path)
+        if issubclass(middleware_class, HTMLOnlyMixin):
+            base = middleware_class.__bases__[-1]
+            path = f'{base.__module__}.{base.__qualname__}'
+        middleware.append(path)
+    if DEBUG_TOOLBAR_MIDDLEWARE not in middleware:
+        middleware.append(DEBUG_TOOLBAR_MIDDLEWARE)
+    return middleware
+
+
+def build_handler(middleware):
+    with override_settings(MIDDLEWARE=middleware):
+        handler = BaseHandler()
+        handler.load_middleware()
+    return handler
+
+
+class Command(BaseCommand):
+    help = 'Time a request through the full and the route-aware middleware stacks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/success-email-verify/', help='Requested API path')
+        parser.add_argument('--count', type=int, default=200, help='Requests per run')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stack')
+
+    def handle(self, *args, **options):
+        path, count, repeat = options['path'], options['count'], options['repeat']
+        request_factory = RequestFactory()
+
+        self.stdout.write(f'{"stack":<10} {"best us/req":>12} {"median us/req":>14} {"peak B/req":>11}')
+        results = {}
+        for name, middleware in [('full', full_middleware()), ('lean', settings.MIDDLEWARE)]:
+            handler = build_handler(middleware)
+            # Timing the error path would compare nothing
+            status_code = handler.get_response(request_factory.get(path)).status_code
+            if status_code != 200:
+                raise CommandError(f'{path} answered {status_code} through the {name} stack')
+
+            def run():
+                for _ in range(count):
+                    handler.get_response(request_factory.get(path))
+
+            result = results[name] = measure(run, count, repeat)
+            self.stdout.write(
+                f'{name:<10} {result["best_us"]:>12.1f} {result["median_us"]:>14.1f} {result["peak_bytes"]:>11.0f}'
+            )
+        saved = results['full']['best_us'] - results['lean']['best_us']
+        self.stdout.write(f'saved {saved:.1f} us/req ({saved / results["full"]["best_us"]:.0%})')
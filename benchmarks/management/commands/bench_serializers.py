@@ -0,0 +1,42 @@
+from importlib import import_module
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.fixtures import build_fixtures
+from benchmarks.harness import measure, model_serializers, no_queries
+
+MODULES = ['ads.serializers', 'housing.serializers', 'users.serializers']
+
+
+class Command(BaseCommand):
+    help = 'Time serialization of in-memory instances for every ModelSerializer without database access'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=500, help='Instances serialized per run')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per serializer')
+        parser.add_argument(
+            '--serializer', action='append', default=[],
+            help='Only benchmark serializers with this class name (can be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        count, repeat, only = options['count'], options['repeat'], options['serializer']
+        fixtures = build_fixtures(count)
+
+        self.stdout.write(
+            f'{"serializer":<55} {"best us/obj":>12} {"median us/obj":>14} {"peak B/obj":>11} {"blocks/obj":>11}'
+        )
+        with no_queries():
+            for module_name in MODULES:
+                for serializer_class in model_serializers(import_module(module_name)):
+                    if only and serializer_class.__name__ not in only:
+                        continue
+                    instances = fixtures[serializer_class.Meta.model]
+                    result = measure(
+                        lambda: serializer_class(instances, many=True).data, count, repeat
+                    )
+                    name = f'{module_name.split(".")[0]}.{serializer_class.__name__}'
+                    self.stdout.write(
+                        f'{name:<55} {result["best_us"]:>12.1f} {result["median_us"]:>14.1f} '
+                        f'{result["peak_bytes"]:>11.0f} {result["blocks"]:>11.1f}'
+                    )
@@ -0,0 +1,39 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+
+# Create your tests here.
+
+
+class SerializerBenchmarkTestCase(SimpleTestCase):
+
+    def test_bench_serializers(self):
+        out = StringIO()
+        call_command('bench_serializers', count=2, repeat=1, stdout=out)
+        output = out.getvalue()
+        assert 'ads.AnnouncementListSerializer' in output
+        assert 'housing.ResidentialComplexSerializer' in output
+        assert 'users.MessageSerializer' in output
+
+
+class MiddlewareBenchmarkTestCase(TestCase):
+
+    def test_bench_middleware(self):
+        # The command fails unless the benchmarked requests answer 200
+        out = StringIO()
+        call_command('bench_middleware', count=2, repeat=1, stdout=out)
+        output = out.getvalue()
+        assert 'full' in output and 'lean' in output
+        assert 'saved' in output
+
+
+class ConnectionBenchmarkTestCase(TransactionTestCase):
+
+    def test_bench_connections(self):
+        out = StringIO()
+        call_command('bench_connections', count=2, repeat=1, stdout=out)
+        output = out.getvalue()
+        assert 'per-request' in output and 'persistent' in output
+        assert 'saved' in output
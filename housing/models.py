@@ -140,9 +140,20 @@ class ResidentialComplex(models.Model):
     class Meta:
         ordering = ('id',)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The owner as loaded, the cached complex of a previous owner is forgotten on reassignment
+        instance._saved_user_id = instance.__dict__.get('user_id')
+        return instance
+
     @property
     def preview_image(self):
-        obj = self.gallery_residential_complex.first()
+        images = getattr(self, '_prefetched_objects_cache', {}).get('gallery_residential_complex')
+        if images is not None:
+            obj = images[0] if images else None
+        else:
+            obj = self.gallery_residential_complex.first()
         if obj:
             return obj.image
 
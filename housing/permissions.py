@@ -1,29 +1,20 @@
 from rest_framework import permissions
+from swipe.ownership import OwnershipPermission
 
 
-class IsMyFilter(permissions.BasePermission):
-
-    def has_object_permission(self, request, view, obj):
-        return bool(request.user.user_filter.filter(id=obj.pk).exists())
+class IsMyFilter(OwnershipPermission):
+    user_path = 'user_id'
 
 
 class IsMyResidentialComplex(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
-        if request.user.is_developer:
-            return request.user.user_residential_complex.id is obj.pk
-        return False
-
+        return bool(request.user.is_developer and obj.user_id == request.user.pk)
 
-class IsMyResidentialComplexObject(permissions.BasePermission):
-
-    def has_object_permission(self, request, view, obj):
-        if request.user.is_developer:
-            return request.user.user_residential_complex.id is obj.residential_complex.pk
-        return False
 
+class IsMyResidentialComplexObject(OwnershipPermission):
+    complex_path = 'residential_complex_id'
 
-class IsMyApartment(permissions.BasePermission):
 
-    def has_object_permission(self, request, view, obj):
-        return request.user.user_apartment.filter(id=obj.pk).exists()
+class IsMyApartment(OwnershipPermission):
+    complex_path = 'announcement.residential_complex_id'
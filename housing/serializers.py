@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from drf_spectacular.utils import extend_schema_serializer, OpenApiExample
 from rest_framework import serializers
 from ads.models import Announcement, Apartment
+from swipe.serializers import CompiledListSerializer
 from users.models import Contact
 from .services.base_64_data import get_base_64_images
 from .validators import resident_complex_validator
@@ -81,6 +82,7 @@ class ApartmentComplexSerializer(serializers.ModelSerializer):
     class Meta:
         model = Apartment
         fields = ['id', 'corpus', 'is_booked', 'price_to_meter']
+        list_serializer_class = CompiledListSerializer
 
 
 class AnnouncementComplexSerializer(serializers.ModelSerializer):
@@ -89,6 +91,7 @@ class AnnouncementComplexSerializer(serializers.ModelSerializer):
     class Meta:
         model = Announcement
         fields = ['announcement_apartment', 'area', 'price']
+        list_serializer_class = CompiledListSerializer
 
 
 class UserIsBuilderSerializer(serializers.ModelSerializer):
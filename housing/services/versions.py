@@ -0,0 +1,19 @@
+from swipe.versioning import version_key, bump_versions
+
+
+def bump_residential_complex_versions(residential_complex_ids):
+    """
+    Invalidate the feed and the given residential complexes
+    """
+    bump_versions([
+        version_key('complex'),
+        *(version_key('complex', pk) for pk in residential_complex_ids if pk is not None),
+    ])
+
+
+def residential_complex_version_keys(view, request, *args, **kwargs):
+    return [version_key('complex', kwargs[view.lookup_url_kwarg or view.lookup_field])]
+
+
+def favorites_residential_complex_version_keys(view, request, *args, **kwargs):
+    return [version_key('favorites_complex', request.user.pk), version_key('complex')]
@@ -1,7 +1,12 @@
 from django.dispatch import receiver
-from django.db.models.signals import post_save
-from housing.models import ResidentialComplex
+from django.db.models.signals import post_save, post_delete
+from housing.models import (
+    ResidentialComplex, ResidentialComplexBenefits, RegistrationAndPayment,
+    ResidentialComplexNews, GalleryResidentialComplex, Document
+)
 from housing.services.initial_data_for_complex import create_data_for_residential_complex
+from housing.services.versions import bump_residential_complex_versions
+from swipe.ownership import forget_residential_complex
 
 
 @receiver(post_save, sender=ResidentialComplex)
@@ -9,3 +14,28 @@ def post_save_residential_complex(created, **kwargs):
     instance = kwargs.get('instance')
     if created:
         create_data_for_residential_complex(instance)
+
+
+@receiver(post_save, sender=ResidentialComplex)
+@receiver(post_delete, sender=ResidentialComplex)
+def residential_complex_changed(instance, **kwargs):
+    bump_residential_complex_versions([instance.id])
+    forget_residential_complex(instance.user_id)
+    saved_user_id = getattr(instance, '_saved_user_id', None)
+    if saved_user_id is not None and saved_user_id != instance.user_id:
+        forget_residential_complex(saved_user_id)
+    instance._saved_user_id = instance.user_id
+
+
+@receiver(post_save, sender=ResidentialComplexBenefits)
+@receiver(post_delete, sender=ResidentialComplexBenefits)
+@receiver(post_save, sender=RegistrationAndPayment)
+@receiver(post_delete, sender=RegistrationAndPayment)
+@receiver(post_save, sender=ResidentialComplexNews)
+@receiver(post_delete, sender=ResidentialComplexNews)
+@receiver(post_save, sender=GalleryResidentialComplex)
+@receiver(post_delete, sender=GalleryResidentialComplex)
+@receiver(post_save, sender=Document)
+@receiver(post_delete, sender=Document)
+def residential_complex_part_changed(instance, **kwargs):
+    bump_residential_complex_versions([instance.residential_complex_id])
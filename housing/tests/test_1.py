@@ -1,6 +1,12 @@
 from django.contrib.auth import get_user_model
+from types import SimpleNamespace
+
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APIClient, APITestCase
+from housing.models import ResidentialComplex, ResidentialComplexNews
+from housing.permissions import IsMyResidentialComplex, IsMyResidentialComplexObject
+from swipe.ownership import residential_complex_id
 
 
 # Create your tests here.
@@ -12,6 +18,7 @@ client = APIClient()
 class IsUserTestCase(APITestCase):
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create(
             email='admin@admin.com',
             first_name='Test',
@@ -25,6 +32,7 @@ class IsUserTestCase(APITestCase):
 class IsDeveloperTestCase(APITestCase):
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create(
             email='admin@admin.com',
             first_name='Test',
@@ -101,3 +109,39 @@ class ResidentialComplexTestCase(IsDeveloperTestCase):
         response = self.client.put(url, data=data, format='json')
         assert response.status_code == 200
 
+
+
+class OwnershipTestCase(IsDeveloperTestCase):
+
+    def test_object_permissions_without_queries(self):
+        other = User.objects.create(email='other@admin.com', is_developer=True)
+        my_complex = ResidentialComplex.objects.get(user=self.user)
+        news = [
+            ResidentialComplexNews.objects.create(title='Mine', text='Text', residential_complex=my_complex),
+            ResidentialComplexNews.objects.create(
+                title='Other', text='Text', residential_complex=ResidentialComplex.objects.get(user=other)
+            ),
+        ]
+        self.user = User.objects.get(pk=self.user.pk)
+        request = SimpleNamespace(user=self.user)
+        permission = IsMyResidentialComplexObject()
+
+        with self.assertNumQueries(1):
+            assert permission.has_object_permission(request, None, news[0])
+        with self.assertNumQueries(0):
+            assert not permission.has_object_permission(request, None, news[1])
+            assert IsMyResidentialComplex().has_object_permission(request, None, my_complex)
+
+        url = reverse('housing:residential-complex-news-detail', kwargs={'pk': news[1].pk})
+        assert self.client.delete(url).status_code == 403
+        url = reverse('housing:residential-complex-news-detail', kwargs={'pk': news[0].pk})
+        assert self.client.delete(url).status_code == 200
+
+    def test_reassigned_complex_forgotten(self):
+        my_complex = ResidentialComplex.objects.get(user=self.user)
+        assert residential_complex_id(User.objects.get(pk=self.user.pk)) == my_complex.id
+        other = User.objects.create(email='other@admin.com', is_developer=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            my_complex.user = other
+            my_complex.save()
+        assert residential_complex_id(User.objects.get(pk=self.user.pk)) is None
@@ -1,5 +1,6 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
+from swipe.async_views import async_routes
 from housing.views import (
     ResidentialComplexViewSet, ResidentialComplexNewsViewSet, ResidentialComplexDocumentViewSet,
     FavoritesResidentialComplexViewSet
@@ -14,5 +15,7 @@ router.register('complex-document', ResidentialComplexDocumentViewSet, basename=
 router.register('complex-favorites', FavoritesResidentialComplexViewSet, basename='residential-complex-favorites')
 
 urlpatterns = [
-    path('', include(router.urls))
+    path('', include(async_routes(router.urls, [
+        'residential-complex-detail', 'residential-complex-favorites-get'
+    ])))
 ]
@@ -8,8 +8,13 @@ from drf_psq import PsqMixin, Rule
 from rest_framework import mixins, status
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
+from swipe.mixins import SparseFieldsMixin
+from swipe.parsers import MessagePackParser
+from swipe.caching import cached_page_data
+from swipe.versioning import versioned
 from users.permissions import IsDeveloper
 from .permissions import IsMyResidentialComplex, IsMyResidentialComplexObject
+from .services.versions import residential_complex_version_keys, favorites_residential_complex_version_keys
 from .serializers import (
     ResidentialComplexSerializer, ResidentialComplexNewsSerializer,
     ResidentialComplexDocumentSerializer, UserFavoritesResidentialComplexSerializer
@@ -29,12 +34,13 @@ User = get_user_model()
 @extend_schema(methods=['PUT'],
                description='Update residential complex. Permissions: [IsMyResidentialComplex, IsAdminUser]')
 class ResidentialComplexViewSet(PsqMixin,
+                                SparseFieldsMixin,
                                 mixins.RetrieveModelMixin,
                                 mixins.UpdateModelMixin,
                                 GenericViewSet):
     serializer_class = ResidentialComplexSerializer
     permission_classes = [IsAuthenticated]
-    parser_classes = [JSONParser]
+    parser_classes = [JSONParser, MessagePackParser]
     http_method_names = ['get', 'post', 'put']
 
     def get_queryset(self):
@@ -51,11 +57,19 @@ class ResidentialComplexViewSet(PsqMixin,
         ]
     }
 
+    @versioned(residential_complex_version_keys)
+    def retrieve(self, request, *args, **kwargs):
+        data = cached_page_data(
+            self, 'residential_complex',
+            lambda: super(ResidentialComplexViewSet, self).retrieve(request, *args, **kwargs).data
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
     @extend_schema(description='Get my residential complex, Permissions: IsMyResidentialComplex', methods=["GET"])
     @action(detail=False, permission_classes=[IsMyResidentialComplex])
     def get_my_complex(self, request):
-        obj = get_object_or_404(ResidentialComplex, user=request.user)
-        serializer = self.serializer_class(obj)
+        obj = get_object_or_404(self.prune_queryset(self.get_queryset()), user=request.user)
+        serializer = self.get_sparse_serializer(self.serializer_class, obj)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -69,6 +83,7 @@ class ResidentialComplexViewSet(PsqMixin,
     description='Update and delete news. Permissions: [IsAdminUser, IsMyResidentialComplexObject]'
 )
 class ResidentialComplexNewsViewSet(PsqMixin,
+                                    SparseFieldsMixin,
                                     mixins.CreateModelMixin,
                                     mixins.RetrieveModelMixin,
                                     mixins.UpdateModelMixin,
@@ -113,6 +128,7 @@ class ResidentialComplexNewsViewSet(PsqMixin,
     description='Update and delete document Permissions: [IsAdminUser, IsMyResidentialComplexObject]'
 )
 class ResidentialComplexDocumentViewSet(PsqMixin,
+                                        SparseFieldsMixin,
                                         mixins.CreateModelMixin,
                                         mixins.RetrieveModelMixin,
                                         mixins.UpdateModelMixin,
@@ -160,16 +176,20 @@ class ResidentialComplexDocumentViewSet(PsqMixin,
     ]
 )
 @extend_schema(methods=['POST'], description='Permissions: IsAuthenticated')
-class FavoritesResidentialComplexViewSet(mixins.CreateModelMixin,
+class FavoritesResidentialComplexViewSet(SparseFieldsMixin,
+                                         mixins.CreateModelMixin,
                                          GenericViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = UserFavoritesResidentialComplexSerializer
     queryset = User.objects.all()
+    throttle_scopes = {'create': 'favorites', 'delete': 'favorites'}
+    replica_actions = ['get']
 
     @extend_schema(description='Get residential complex favorites, Permissions: IsAuthenticated', methods=["GET"])
     @action(detail=False)
+    @versioned(favorites_residential_complex_version_keys)
     def get(self, request):
-        serializer = self.serializer_class(request.user)
+        serializer = self.get_sparse_serializer(self.serializer_class, request.user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def create(self, request, *args, **kwargs):
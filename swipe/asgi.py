@@ -9,8 +9,12 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'swipe.settings')
+django.setup(set_prefix=False)
 
-application = get_asgi_application()
+# Imported once the apps are ready, as get_asgi_application() does for Django's handler
+from swipe.async_views import StreamingASGIHandler  # noqa: E402
+
+application = StreamingASGIHandler()
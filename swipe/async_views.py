@@ -0,0 +1,107 @@
+"""
+Async entry points of the hot read endpoints under an ASGI server. Django 3.2 has no async ORM, so this
+is an adaptation: the views stay synchronous and run in the thread pool of the event loop, the event loop
+only overlaps their database waits. Streamed bodies stay lazy and are iterated in a thread of their own
+by ``StreamingASGIHandler``
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.base import BaseHandler
+from django.db import close_old_connections, connections, transaction
+from django.urls import URLPattern
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _run_view(view, atomic_view, request, *args, **kwargs):
+    # The request_started/request_finished signals close the connections of the event loop thread,
+    # the pool threads have to recycle theirs themselves
+    close_old_connections()
+    try:
+        if request.method not in SAFE_METHODS:
+            view = atomic_view
+        response = view(request, *args, **kwargs)
+        if not response.streaming and hasattr(response, 'render'):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_view(view):
+    """
+    Wrap a synchronous view into a coroutine running it in the thread pool of the event loop,
+    so under an ASGI server one worker overlaps the database waits of many requests.
+    Unlike the thread-sensitive default of Django the requests do not queue on a single thread.
+    Django can not wrap coroutines with ``ATOMIC_REQUESTS``, the safe methods run without a transaction
+    and the others in the transaction of ``ATOMIC_REQUESTS`` opened in the pool thread
+    """
+    run_view = sync_to_async(_run_view, thread_sensitive=False)
+    atomic_view = BaseHandler().make_view_atomic(view)
+
+    @transaction.non_atomic_requests
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        return await run_view(view, atomic_view, request, *args, **kwargs)
+
+    return wrapper
+
+
+def async_routes(urlpatterns, names):
+    """
+    Serve the routes of ``urlpatterns`` called ``names`` by async views when ``ASYNC_READ_VIEWS`` is on.
+    Returns new patterns, ``urlpatterns`` are left as they are
+    """
+    if not settings.ASYNC_READ_VIEWS:
+        return urlpatterns
+    return [
+        URLPattern(pattern.pattern, async_view(pattern.callback), pattern.default_args, pattern.name)
+        if isinstance(pattern, URLPattern) and pattern.name in names else pattern
+        for pattern in urlpatterns
+    ]
+
+
+def _close_connections():
+    connections.close_all()
+
+
+class StreamingASGIHandler(ASGIHandler):
+    """
+    ``ASGIHandler`` iterating streamed bodies in a thread of their own. Django 3.2 iterates them on the
+    event loop, where the rows read lazily by the iterator can not be fetched
+    """
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            return await super().send_response(response, send)
+        headers = [
+            (
+                header.encode('ascii') if isinstance(header, str) else bytes(header),
+                value.encode('latin1') if isinstance(value, str) else bytes(value),
+            )
+            for header, value in response.items()
+        ]
+        headers += [(b'Set-Cookie', cookie.output(header='').encode('ascii').strip())
+                    for cookie in response.cookies.values()]
+        await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+
+        loop = asyncio.get_running_loop()
+        # One thread keeps the connection the iterator reads with
+        executor = ThreadPoolExecutor(max_workers=1)
+        parts = iter(response)
+        try:
+            while True:
+                part = await loop.run_in_executor(executor, next, parts, None)
+                if part is None:
+                    break
+                for chunk, _ in self.chunk_bytes(part):
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body'})
+        finally:
+            await loop.run_in_executor(executor, response.close)
+            await loop.run_in_executor(executor, _close_connections)
+            executor.shutdown(wait=False)
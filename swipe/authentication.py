@@ -0,0 +1,80 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .denylist import is_denied
+
+USER_PREFIX = 'user'
+USER_CACHE_TIMEOUT = 60
+
+
+def user_cache_key(user_id):
+    return f'{USER_PREFIX}:{user_id}'
+
+
+def forget_cached_user(user_id):
+    """
+    Drop the cached user once the current transaction commits
+    """
+    transaction.on_commit(lambda: cache.delete(user_cache_key(user_id)))
+
+
+def check_not_denied(user_id):
+    if is_denied(user_id):
+        raise AuthenticationFailed(_('User is blacklisted'), code='user_blacklisted')
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` loading the user from the cache, the row is read at most once
+    in ``USER_CACHE_TIMEOUT`` seconds and dropped from the cache when the user is saved.
+    Blacklisted users are rejected by the deny set before any lookup
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            return super().get_user(validated_token)
+        check_not_denied(user_id)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, timeout=USER_CACHE_TIMEOUT)
+        elif not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
+
+
+class ClaimsUser(TokenUser):
+    """
+    User built from the claims of the token only (see ``swipe.tokens``), the role flags are those at login
+    """
+
+    @cached_property
+    def is_developer(self):
+        return self.token.get('is_developer', False)
+
+    @cached_property
+    def is_blacklist(self):
+        return self.token.get('is_blacklist', False)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authentication without any lookup of the user, for read endpoints that need only
+    the id and the role flags of the user. ``request.user`` is not a model instance
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        check_not_denied(validated_token[api_settings.USER_ID_CLAIM])
+        return ClaimsUser(validated_token)
+
@@ -0,0 +1,176 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlsplit
+
+import orjson
+from django.core.exceptions import PermissionDenied
+from django.core.handlers.base import BaseHandler
+from django.db import connection, connections, transaction
+from django.http import Http404, HttpRequest, QueryDict
+from django.urls import resolve, Resolver404
+from drf_spectacular.utils import extend_schema, OpenApiExample
+from rest_framework import serializers, status
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+# Headers of the batch request that must not leak into its sub-requests
+SKIPPED_META = ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'HTTP_IF_MATCH',
+                'HTTP_IF_UNMODIFIED_SINCE', 'HTTP_ACCEPT', 'HTTP_IDEMPOTENCY_KEY')
+RETURNED_HEADERS = ('ETag', 'Last-Modified', 'Location')
+
+
+_NO_BODY = object()
+
+
+def build_request(meta, method, url, body=_NO_BODY, user=None, auth=None):
+    """
+    Build a request for the view of ``url`` in-process, with the headers of ``meta``
+    and ``user`` authenticated (the authentication classes do not run for it)
+    """
+    url = urlsplit(url)
+    request = HttpRequest()
+    request.META = {key: value for key, value in meta.items() if key not in SKIPPED_META}
+    request.META.update(REQUEST_METHOD=method, PATH_INFO=url.path, QUERY_STRING=url.query)
+    request.method = method
+    request.path = request.path_info = url.path
+    request.GET = QueryDict(url.query)
+    if body is not _NO_BODY:
+        body = orjson.dumps(body)
+        request.META.update(CONTENT_TYPE='application/json', CONTENT_LENGTH=str(len(body)))
+        request._stream = BytesIO(body)
+        request._read_started = False
+    request._force_auth_user = user
+    request._force_auth_token = auth
+    return request
+
+
+class SubRequestSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False, help_text='Returned with the response to match it')
+    method = serializers.ChoiceField(choices=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'], default='GET')
+    url = serializers.CharField(help_text='Path with the query string: /user-filter/?fields=id,name')
+    body = serializers.JSONField(required=False)
+
+    def validate_url(self, value):
+        if not value.startswith('/'):
+            raise serializers.ValidationError('Must be a path starting with /')
+        try:
+            match = resolve(urlsplit(value).path)
+        except Resolver404:
+            # Answered with 404 in the batch
+            return value
+        view_class = getattr(match.func, 'cls', None)
+        if not (isinstance(view_class, type) and issubclass(view_class, APIView)):
+            # The HTML pages need the middleware and do not answer JSON
+            raise serializers.ValidationError('Must be a path of the API')
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        if len(value) > BatchView.max_requests:
+            raise serializers.ValidationError(f'No more than {BatchView.max_requests} requests')
+        return value
+
+
+class SubResponseSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False)
+    status = serializers.IntegerField()
+    headers = serializers.DictField(child=serializers.CharField())
+    body = serializers.JSONField(allow_null=True)
+
+
+class BatchResponseSerializer(serializers.Serializer):
+    responses = SubResponseSerializer(many=True)
+
+
+@extend_schema(
+    tags=['batch'],
+    description='Run several requests of the authenticated user in one round-trip. '
+                'Read-only batches run concurrently, batches with writes run in order. Permissions: IsAuthenticated',
+    request=BatchSerializer,
+    responses=BatchResponseSerializer,
+    examples=[OpenApiExample('Example', request_only=True, value={'requests': [
+        {'id': 'profile', 'url': '/user-profile/get_profile/'},
+        {'id': 'filters', 'url': '/user-filter/?fields=id,name'},
+        {'id': 'favorites', 'url': '/ads/announcement-favorites/get/'},
+    ]})]
+)
+class BatchView(GenericAPIView):
+    """
+    The sub-requests are dispatched in-process to the views of their urls, the user authenticated
+    for the batch is forced on them so the token is checked once. Middleware does not run for them,
+    each one gets its own transaction as a request does with ``ATOMIC_REQUESTS``
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = BatchSerializer
+    max_requests = 20
+    max_workers = 6
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # A single transaction for the whole batch would keep the reads from running concurrently
+        return transaction.non_atomic_requests(super().as_view(**initkwargs))
+
+    def build_request(self, sub_request):
+        return build_request(
+            self.request._request.META, sub_request['method'], sub_request['url'], sub_request.get('body', _NO_BODY),
+            self.request.user, self.request.auth
+        )
+
+    def dispatch_request(self, sub_request):
+        result = {'id': sub_request['id']} if 'id' in sub_request else {}
+        try:
+            match = resolve(urlsplit(sub_request['url']).path)
+        except Resolver404:
+            return {**result, 'status': status.HTTP_404_NOT_FOUND, 'headers': {}, 'body': None}
+        if getattr(match.func, 'view_class', None) is BatchView:
+            return {**result, 'status': status.HTTP_400_BAD_REQUEST, 'headers': {},
+                    'body': {'detail': 'Batches can not be nested'}}
+
+        view = BaseHandler().make_view_atomic(match.func)
+        try:
+            response = view(self.build_request(sub_request), *match.args, **match.kwargs)
+            if hasattr(response, 'data'):
+                body = response.data
+            else:
+                content = b''.join(response.streaming_content) if response.streaming else response.content
+                body = orjson.loads(content) if content else None
+        except Http404:
+            return {**result, 'status': status.HTTP_404_NOT_FOUND, 'headers': {}, 'body': None}
+        except PermissionDenied:
+            return {**result, 'status': status.HTTP_403_FORBIDDEN, 'headers': {}, 'body': None}
+        except Exception:
+            # One failed sub-request does not fail the others
+            logger.exception('Sub-request %s %s failed', sub_request['method'], sub_request['url'])
+            return {**result, 'status': status.HTTP_500_INTERNAL_SERVER_ERROR, 'headers': {}, 'body': None}
+        headers = {name: response[name] for name in RETURNED_HEADERS if response.has_header(name)}
+        return {**result, 'status': response.status_code, 'headers': headers, 'body': body}
+
+    def dispatch_concurrently(self, sub_request):
+        try:
+            return self.dispatch_request(sub_request)
+        finally:
+            # Every worker thread opens its own connections
+            connections.close_all()
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        sub_requests = serializer.validated_data['requests']
+
+        # Other threads use their own connections and would not see the changes of an open transaction
+        concurrent = (len(sub_requests) > 1 and not connection.in_atomic_block
+                      and all(sub_request['method'] in SAFE_METHODS for sub_request in sub_requests))
+        if concurrent:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(sub_requests))) as executor:
+                responses = list(executor.map(self.dispatch_concurrently, sub_requests))
+        else:
+            responses = [self.dispatch_request(sub_request) for sub_request in sub_requests]
+        return Response({'responses': responses}, status=status.HTTP_200_OK)
@@ -0,0 +1,130 @@
+import logging
+import threading
+from hashlib import sha1
+from math import log
+from random import random
+from time import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django_redis import get_redis_connection
+
+from .coalescing import single_flight, flight_key
+from .middleware import mark_precompressed
+from .routers import read_from_primary
+
+logger = logging.getLogger(__name__)
+
+PAGE_PREFIX = 'page'
+POPULAR_PREFIX = 'popular'
+
+
+def _build_entry(compute, stamps):
+    started = time()
+    value = compute()
+    delta = time() - started
+    return value, stamps, time() + settings.PAGE_CACHE_TIMEOUT, delta
+
+
+def _store_entry(key, entry):
+    cache.set(key, entry, timeout=settings.PAGE_CACHE_TIMEOUT + settings.PAGE_CACHE_STALE_TIMEOUT)
+
+
+def _refresh(key, compute, stamps):
+    try:
+        _store_entry(key, _build_entry(compute, stamps))
+    except Exception:
+        logger.exception('Refresh of %s failed', key)
+    finally:
+        cache.delete(f'{key}:refresh')
+        connections.close_all()
+
+
+def refresh_in_background(key, compute, stamps):
+    """
+    Rebuild the entry in a thread unless another worker is already rebuilding it
+    """
+    if cache.add(f'{key}:refresh', 1, timeout=settings.PAGE_CACHE_STALE_TIMEOUT):
+        threading.Thread(target=_refresh, args=(key, compute, stamps), daemon=True).start()
+
+
+def stale_while_revalidate(key, compute, stamps, beta=1.0):
+    """
+    Return the value of the cache entry ``key`` built for the version ``stamps``.
+    An entry older than ``PAGE_CACHE_TIMEOUT`` is stale: it is still served for
+    ``PAGE_CACHE_STALE_TIMEOUT`` seconds while a thread rebuilds it. Fresh entries are rebuilt
+    early with a probability growing towards the expiry and with the time the build took (XFetch),
+    so the rebuilds of a popular entry do not happen at once. Missing entries and entries of
+    other versions are built in place, concurrent builds are coalesced
+    """
+    entry = cache.get(key)
+    if entry is None or entry[1] != stamps:
+        entry = single_flight(flight_key(key, stamps), lambda: _build_entry(compute, stamps))
+        _store_entry(key, entry)
+        return entry[0]
+
+    value, _, expires_at, delta = entry
+    if time() - delta * beta * log(1 - random()) >= expires_at:
+        refresh_in_background(key, compute, stamps)
+    return value
+
+
+def record_page_request(name, uri):
+    """
+    Count a request of the ``name`` page ``uri`` for the cache warmer, only Redis keeps the counts
+    """
+    try:
+        get_redis_connection().zincrby(f'{POPULAR_PREFIX}:{name}', 1, uri)
+    except NotImplementedError:
+        pass
+
+
+def popular_page_scores(name, limit):
+    """
+    Return the ``limit`` most requested URIs of the ``name`` page with their counts
+    """
+    try:
+        pages = get_redis_connection().zrevrange(f'{POPULAR_PREFIX}:{name}', 0, limit - 1, withscores=True)
+    except NotImplementedError:
+        return []
+    return [(uri.decode(), score) for uri, score in pages]
+
+
+def popular_pages(name, limit):
+    """
+    Return the ``limit`` most requested URIs of the ``name`` page
+    """
+    return [uri for uri, _ in popular_page_scores(name, limit)]
+
+
+def trim_popular_pages(name, keep):
+    """
+    Forget all but the ``keep`` most requested URIs and halve the counts so old peaks fade out
+    """
+    try:
+        redis = get_redis_connection()
+    except NotImplementedError:
+        return
+    key = f'{POPULAR_PREFIX}:{name}'
+    redis.zremrangebyrank(key, 0, -keep - 1)
+    redis.zunionstore(key, {key: 0.5})
+
+
+def cached_page_data(view, name, compute, stamps=None):
+    """
+    Serve the data of a ``versioned`` view method by ``stale_while_revalidate`` keyed by the absolute URI.
+    ``stamps`` are the version stamps the data depends on, all stamps of the view by default.
+    The compressed body of the response is cached as well. The data is read from the primary,
+    a lagging replica would leave old data in the cache under the new stamps
+    """
+    uri = view.request.build_absolute_uri()
+    record_page_request(name, uri)
+    mark_precompressed(view.request)
+    key = f'{PAGE_PREFIX}:{name}:{sha1(uri.encode()).hexdigest()}'
+
+    def compute_on_primary():
+        with read_from_primary():
+            return compute()
+
+    return stale_while_revalidate(key, compute_on_primary, view.version_stamps if stamps is None else stamps)
@@ -8,18 +8,37 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 app.conf.beat_schedule = {
-    'check-every-day-in-00:00-for-activate': {
+    'renew-subscriptions-every-minute': {
         'task': 'users.tasks.activate_user_subscription',
-        'schedule': crontab(minute=0, hour=0),
+        'schedule': crontab(),
     },
-
-    'check-every-day-in-00:00-for-deactivate': {
+    'expire-subscriptions-every-minute': {
         'task': 'users.tasks.deactivate_user_subscription',
-        'schedule': crontab(minute=0, hour=0),
+        'schedule': crontab(),
     },
-    'check-every-day-in-00:00-for-deactivate_adv': {
+    'expire-advertising-every-minute': {
         'task': 'ads.tasks.deactivate_announcement_advertising',
-        'schedule': crontab(minute=0, hour=0),
+        'schedule': crontab(),
+    },
+    'publish-feed-snapshots-every-minute': {
+        'task': 'ads.tasks.publish_feed_snapshots',
+        'schedule': crontab(),
+    },
+    'relay-events-every-10-seconds': {
+        'task': 'sync.tasks.relay_events',
+        'schedule': 10.0,
+    },
+    'prune-changes-every-day': {
+        'task': 'sync.tasks.prune_changes',
+        'schedule': crontab(minute=0, hour=3),
+    },
+    'prune-events-every-day': {
+        'task': 'sync.tasks.prune_events',
+        'schedule': crontab(minute=30, hour=3),
+    },
+    'warm-caches-every-30-minutes': {
+        'task': 'ads.tasks.warm_caches',
+        'schedule': crontab(minute='*/30'),
     },
 }
 app.conf.timezone = 'Europe/Kiev'
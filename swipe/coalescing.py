@@ -0,0 +1,83 @@
+import threading
+from hashlib import sha1
+
+from django.core.cache import cache
+from redis.exceptions import LockError
+
+FLIGHT_PREFIX = 'flight'
+_MISSING = object()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def flight_key(*parts):
+    """
+    Key of a computation identified by ``parts`` (version stamps, absolute URI, ...)
+    """
+    return sha1(repr(parts).encode()).hexdigest()
+
+
+def _shared_flight(key, compute, timeout, result_timeout):
+    # Backends without locks (locmem in tests) only coalesce within the process
+    if not hasattr(cache, 'lock'):
+        return compute()
+    result_key = f'{FLIGHT_PREFIX}:{key}'
+    result = cache.get(result_key, _MISSING)
+    if result is not _MISSING:
+        return result
+    lock = cache.lock(f'{result_key}:lock', timeout=timeout, blocking_timeout=timeout)
+    if not lock.acquire():
+        return compute()
+    try:
+        # The process holding the lock before us has stored its result
+        result = cache.get(result_key, _MISSING)
+        if result is _MISSING:
+            result = compute()
+            cache.set(result_key, result, timeout=result_timeout)
+        return result
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            pass
+
+
+def single_flight(key, compute, timeout=10, result_timeout=5):
+    """
+    Return ``compute()`` sharing one computation between the concurrent calls with the same key:
+    threads of the process wait for the first one, processes wait on a Redis lock for the result
+    the holder leaves in the cache for ``result_timeout`` seconds. Waiters compute by themselves
+    after ``timeout`` seconds
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        if not flight.done.wait(timeout):
+            return compute()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    try:
+        flight.result = _shared_flight(key, compute, timeout, result_timeout)
+        return flight.result
+    except Exception as error:
+        flight.error = error
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
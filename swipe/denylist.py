@@ -0,0 +1,116 @@
+import logging
+import threading
+from time import monotonic
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+DENY_SET_KEY = 'blacklist:users'
+DENY_CHANNEL = 'blacklist:changed'
+# Seconds a process trusts its copy without pub/sub (no Redis or the subscription is down)
+DENY_SET_TIMEOUT = 5
+# Seconds between full reloads with pub/sub, in case a message was lost
+DENY_SET_RESYNC = 300
+
+
+def _blacklisted_ids():
+    return {str(pk) for pk in get_user_model().objects.filter(is_blacklist=True).values_list('id', flat=True)}
+
+
+class DenySet:
+    """
+    Per-process copy of the ids of the blacklisted users, checked by the authentication on every request.
+    With Redis the ids are the Redis set ``DENY_SET_KEY`` and changes are pushed to every process
+    through the ``DENY_CHANNEL`` channel, otherwise the copy is reloaded from the cache every
+    ``DENY_SET_TIMEOUT`` seconds. A missing set is rebuilt from the users table
+    """
+
+    def __init__(self):
+        self.ids = frozenset()
+        self.loaded_at = None
+        self.listening = False
+        self.lock = threading.Lock()
+
+    def __contains__(self, user_id):
+        if self.is_stale():
+            with self.lock:
+                if self.is_stale():
+                    self.reload()
+        return str(user_id) in self.ids
+
+    def is_stale(self):
+        timeout = DENY_SET_RESYNC if self.listening else DENY_SET_TIMEOUT
+        return self.loaded_at is None or monotonic() - self.loaded_at >= timeout
+
+    def reload(self):
+        try:
+            redis = get_redis_connection()
+        except NotImplementedError:
+            ids = cache.get(DENY_SET_KEY)
+            if ids is None:
+                ids = _blacklisted_ids()
+                cache.set(DENY_SET_KEY, ids, timeout=None)
+        else:
+            ids = {pk.decode() for pk in redis.smembers(DENY_SET_KEY)}
+            if not ids:
+                ids = _blacklisted_ids()
+                if ids:
+                    redis.sadd(DENY_SET_KEY, *ids)
+            self.listen(redis)
+        self.ids = frozenset(ids)
+        self.loaded_at = monotonic()
+
+    def apply(self, message):
+        """
+        Apply a ``+<id>`` (blacklisted) or ``-<id>`` (removed from the blacklist) message
+        """
+        message = message.decode() if isinstance(message, bytes) else message
+        if message[0] == '+':
+            self.ids = self.ids | {message[1:]}
+        else:
+            self.ids = self.ids - {message[1:]}
+
+    def listen(self, redis):
+        if not self.listening:
+            self.listening = True
+            threading.Thread(target=self._listen, args=(redis,), daemon=True).start()
+
+    def _listen(self, redis):
+        pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(DENY_CHANNEL)
+            for message in pubsub.listen():
+                self.apply(message['data'])
+        except Exception:
+            logger.exception('Subscription to %s failed', DENY_CHANNEL)
+        finally:
+            self.listening = False
+            self.loaded_at = None
+            pubsub.close()
+
+
+deny_set = DenySet()
+
+
+def is_denied(user_id):
+    return user_id in deny_set
+
+
+def set_denied(user_id, denied):
+    """
+    Add the user to the deny set of every process or remove it
+    """
+    user_id = str(user_id)
+    message = f'+{user_id}' if denied else f'-{user_id}'
+    try:
+        redis = get_redis_connection()
+    except NotImplementedError:
+        cache.delete(DENY_SET_KEY)
+    else:
+        changed = redis.sadd(DENY_SET_KEY, user_id) if denied else redis.srem(DENY_SET_KEY, user_id)
+        if changed:
+            redis.publish(DENY_CHANNEL, message)
+    deny_set.apply(message)
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.utils import timezone
+
+# Objects expired in one transaction
+EXPIRY_BATCH_SIZE = 100
+
+
+def expire_due(queryset, expire, batch_size=EXPIRY_BATCH_SIZE):
+    """
+    Call ``expire`` with the objects of ``queryset`` whose ``date_end`` passed, a batch at a time in its
+    own transaction. The rows of a batch are locked and skipped by concurrent runs, ``expire`` has to
+    take them out of ``queryset``. Models index ``date_end`` for the due objects so a run with nothing
+    due is a single index lookup. Returns the number of expired objects
+    """
+    expired = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                queryset.filter(date_end__lt=timezone.localdate())
+                .select_for_update(skip_locked=True)
+                .order_by('date_end', 'id')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if ids:
+                expire(queryset.model.objects.filter(id__in=ids))
+        expired += len(ids)
+        if len(ids) < batch_size:
+            return expired
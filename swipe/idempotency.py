@@ -0,0 +1,110 @@
+import json
+from hashlib import sha1
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_PREFIX = 'idempotency'
+IDEMPOTENCY_HEADER = 'HTTP_IDEMPOTENCY_KEY'
+# Seconds a response is replayed for retries with the same key
+IDEMPOTENCY_TIMEOUT = 24 * 60 * 60
+# Seconds a key stays taken by a request that is still running, freed sooner when it ends
+IDEMPOTENCY_LOCK_TIMEOUT = 120
+_PENDING = 'pending'
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name='Idempotency-Key', type=str, location=OpenApiParameter.HEADER, required=False,
+    description='Unique key of the request, retries with the same key get the response of the first request'
+)
+
+
+def idempotency_cache_key(request, key):
+    digest = sha1(f'{request.user.pk}:{request.path}:{key}'.encode()).hexdigest()
+    return f'{IDEMPOTENCY_PREFIX}:{digest}'
+
+
+def _fingerprint_value(value):
+    if isinstance(value, UploadedFile):
+        return [value.name, value.size]
+    return value
+
+
+def request_fingerprint(request):
+    """
+    Digest of the parsed body, uploaded files count by name and size
+    """
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = {name: [_fingerprint_value(value) for value in values] for name, values in data.lists()}
+    return sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _replay(entry):
+    _, status_code, data, headers = entry
+    response = Response(data, status=status_code, headers=headers)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+class IdempotentCreateMixin:
+    """
+    ``create`` with an ``Idempotency-Key`` header runs once per user, path and key: the response
+    is kept for ``IDEMPOTENCY_TIMEOUT`` seconds and replayed to retries with the same body, a retry
+    arriving while the first request runs gets 409 and a reuse of the key with another body 422.
+    Uploaded files of a replayed request are not processed again. Only committed successful
+    responses are kept, the key is freed when the request fails or its transaction rolls back
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.META.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+
+        cache_key = idempotency_cache_key(request, key)
+        fingerprint = request_fingerprint(request)
+        while not cache.add(cache_key, (fingerprint, _PENDING), timeout=IDEMPOTENCY_LOCK_TIMEOUT):
+            entry = cache.get(cache_key)
+            if entry is None:
+                continue
+            if entry[0] != fingerprint:
+                return Response(
+                    {'detail': 'The Idempotency-Key was used with another request body'},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                )
+            if entry[1] == _PENDING:
+                return Response(
+                    {'detail': 'A request with this Idempotency-Key is in progress'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            return _replay(entry)
+
+        try:
+            response = super().create(request, *args, **kwargs)
+        except BaseException:
+            cache.delete(cache_key)
+            raise
+        if not status.is_success(response.status_code):
+            cache.delete(cache_key)
+            return response
+
+        headers = {name: value for name, value in response.items() if name != 'Content-Type'}
+        entry = fingerprint, response.status_code, response.data, headers
+        committed = []
+
+        def store():
+            committed.append(True)
+            cache.set(cache_key, entry, timeout=IDEMPOTENCY_TIMEOUT)
+
+        def free_unless_committed():
+            if not committed:
+                cache.delete(cache_key)
+
+        # With ATOMIC_REQUESTS the response is replayed only once the object is committed. The response
+        # is closed after the transaction ended, a rollback discarded store() and the key is freed
+        transaction.on_commit(store)
+        response._resource_closers.append(free_unless_committed)
+        return response
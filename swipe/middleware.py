@@ -0,0 +1,249 @@
+import asyncio
+import gzip
+from hashlib import sha1
+from time import monotonic
+
+import brotli
+from asgiref.sync import async_to_sync, sync_to_async
+from debug_toolbar.middleware import DebugToolbarMiddleware
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.db import connections
+from django.middleware.csrf import CsrfViewMiddleware
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_sequence, compress_string
+from rest_framework.permissions import SAFE_METHODS
+
+from .routers import is_read_action, pin_to_primary, use_replica_for
+
+re_accepts_brotli = _lazy_re_compile(r'\bbr\b')
+re_accepts_gzip = _lazy_re_compile(r'\bgzip\b')
+
+COMPRESSED_PREFIX = 'compressed'
+PRECOMPRESSED_TIMEOUT = 600
+
+
+def _compress_brotli_sequence(sequence):
+    compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=5)
+    for item in sequence:
+        data = compressor.process(item)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def precompressed(content, encoding):
+    """
+    Return ``content`` compressed with ``encoding`` from the cache, compressing it on a miss.
+    Compressed once for many requests, so with slower and better levels
+    """
+    key = f'{COMPRESSED_PREFIX}:{encoding}:{sha1(content).hexdigest()}'
+    compressed = cache.get(key)
+    if compressed is None:
+        if encoding == 'br':
+            compressed = brotli.compress(content, mode=brotli.MODE_TEXT, quality=9)
+        else:
+            compressed = gzip.compress(content, compresslevel=9, mtime=0)
+        cache.set(key, compressed, timeout=PRECOMPRESSED_TIMEOUT)
+    return compressed
+
+
+def mark_precompressed(request):
+    """
+    Keep the compressed body of the response to ``request`` in the cache for identical responses,
+    for pages served from the page cache
+    """
+    request._request.precompress = True
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    ``GZipMiddleware`` that prefers brotli when the client accepts it. Bodies of requests
+    marked by ``mark_precompressed`` are compressed once per content and encoding
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < 200:
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if re_accepts_brotli.search(accept_encoding):
+            encoding = 'br'
+        elif re_accepts_gzip.search(accept_encoding):
+            encoding = 'gzip'
+        else:
+            return response
+
+        if response.streaming:
+            if encoding == 'br':
+                response.streaming_content = _compress_brotli_sequence(response.streaming_content)
+            else:
+                response.streaming_content = compress_sequence(response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            if getattr(request, 'precompress', False):
+                compressed_content = precompressed(response.content, encoding)
+            elif encoding == 'br':
+                compressed_content = brotli.compress(response.content, mode=brotli.MODE_TEXT, quality=5)
+            else:
+                compressed_content = compress_string(response.content)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+
+        return response
+
+
+class AsyncCapableMixin:
+    """
+    Middleware usable by sync and async handlers as ``MiddlewareMixin``: under ASGI ``__acall__`` is
+    used, so the handler does not run the whole request thread-sensitively in a single thread
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Lets the handler see the middleware as a coroutine function, as in MiddlewareMixin
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return self.call(request)
+
+
+class HTMLOnlyMixin:
+    """
+    Run a ``MiddlewareMixin`` middleware (sessions, CSRF, messages, ...) only for the paths starting with
+    one of ``HTML_PATH_PREFIXES``, requests of the JWT API skip it without leaving the async handler.
+    The subclasses keep the Django classes in MIDDLEWARE, where the admin checks look for them
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.html_prefixes = tuple(settings.HTML_PATH_PREFIXES)
+
+    def is_html(self, request):
+        return request.path_info.startswith(self.html_prefixes)
+
+    def __call__(self, request):
+        if self.is_html(request):
+            return super().__call__(request)
+        return self.get_response(request)
+
+
+class HTMLSessionMiddleware(HTMLOnlyMixin, SessionMiddleware):
+    pass
+
+
+class HTMLCsrfViewMiddleware(HTMLOnlyMixin, CsrfViewMiddleware):
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if self.is_html(request):
+            return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class HTMLAuthenticationMiddleware(HTMLOnlyMixin, AuthenticationMiddleware):
+    pass
+
+
+class HTMLMessageMiddleware(HTMLOnlyMixin, MessageMiddleware):
+    pass
+
+
+class HTMLDebugToolbarMiddleware(HTMLOnlyMixin, AsyncCapableMixin, DebugToolbarMiddleware):
+    """
+    The toolbar is synchronous only, in MIDDLEWARE as it is the handler would run every request of the API
+    thread-sensitively. Under ASGI the HTML pages run it in the thread the handler would adapt it to
+    """
+
+    def call(self, request):
+        return DebugToolbarMiddleware.__call__(self, request)
+
+    async def __acall__(self, request):
+        toolbar = DebugToolbarMiddleware(async_to_sync(self.get_response))
+        return await sync_to_async(toolbar, thread_sensitive=True)(request)
+
+
+class ConnectionHealthMiddleware(AsyncCapableMixin):
+    """
+    Close the persistent database connections (``CONN_MAX_AGE``) that stopped working, e.g. after
+    a restart of the database or the pooler, before the view uses them. A connection is checked when
+    it was not checked for ``DATABASE_HEALTH_CHECK_INTERVAL`` seconds, so busy workers do not pay
+    a round trip per request
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.interval = settings.DATABASE_HEALTH_CHECK_INTERVAL
+
+    def check_connections(self):
+        now = monotonic()
+        for connection in connections.all():
+            if connection.connection is None:
+                continue
+            if now - getattr(connection, 'health_checked_at', 0) < self.interval:
+                continue
+            if connection.is_usable():
+                connection.health_checked_at = now
+            else:
+                connection.close()
+
+    def call(self, request):
+        self.check_connections()
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        # The connections of the thread running the synchronous views under ASGI
+        await sync_to_async(self.check_connections, thread_sensitive=True)()
+        return await self.get_response(request)
+
+
+class ReplicaMiddleware(AsyncCapableMixin):
+    """
+    Mark the safe requests of read-only viewset actions for ``swipe.routers.ReplicaRouter`` and pin
+    the users who changed data to the primary for a while
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method in SAFE_METHODS and is_read_action(view_func, request.method):
+            use_replica_for(request)
+
+    def pin_writer(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user.pk)
+
+    def call(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replica_for(None)
+        self.pin_writer(request, response)
+        return response
+
+    async def __acall__(self, request):
+        try:
+            response = await self.get_response(request)
+        finally:
+            use_replica_for(None)
+        await sync_to_async(self.pin_writer, thread_sensitive=True)(request, response)
+        return response
@@ -0,0 +1,165 @@
+from django.db.models import Prefetch, QuerySet
+from django.http import StreamingHttpResponse
+from drf_psq import PsqMixin
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.permissions import SAFE_METHODS
+
+from .serializers import iterate_in_chunks, parse_fieldset, apply_fieldset, fieldset_lookups
+
+STREAM_PARAMETER = OpenApiParameter(
+    name='stream', type=bool, required=False,
+    description='Stream the list in chunks instead of building the whole response in memory'
+)
+
+FIELDS_PARAMETER = OpenApiParameter(
+    name='fields', type=str, required=False,
+    description='Comma separated fields to return, nested fields are separated by a dot: id,creator.phone'
+)
+EXPAND_PARAMETER = OpenApiParameter(
+    name='expand', type=str, required=False,
+    description='Comma separated relations to return as objects instead of ids: creator,residential_complex'
+)
+
+
+def _select_related_paths(tree, prefix=''):
+    for name, subtree in tree.items():
+        if subtree:
+            yield from _select_related_paths(subtree, f'{prefix}{name}__')
+        else:
+            yield f'{prefix}{name}'
+
+
+def _lookup_path(lookup):
+    return lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup
+
+
+def _is_prefetch_path(model, path):
+    for name in path.split('__'):
+        field = model._meta.get_field(name)
+        if field.one_to_many or field.many_to_many:
+            return True
+        model = field.related_model
+    return False
+
+
+def prune_queryset(queryset, serializer):
+    """
+    Drop the select_related()/prefetch_related() lookups ``serializer`` does not read,
+    add the ones its nested serializers need and defer the columns it does not render
+    """
+    lookups = fieldset_lookups(serializer)
+    if lookups is None:
+        return queryset
+    columns, relations = lookups
+    roots = {path.split('__')[0] for path in relations}
+    opts = queryset.model._meta
+
+    prefetch = [lookup for lookup in queryset._prefetch_related_lookups
+                if _lookup_path(lookup).split('__')[0] in roots]
+    select = queryset.query.select_related
+    if select is not True:
+        select = [path for path in _select_related_paths(select or {}) if path.split('__')[0] in roots]
+        covered = [*select, *map(_lookup_path, prefetch)]
+        for path in sorted(relations):
+            if any(lookup == path or lookup.startswith(f'{path}__') for lookup in covered):
+                continue
+            (prefetch if _is_prefetch_path(queryset.model, path) else select).append(path)
+            covered.append(path)
+        queryset = queryset.select_related(None)
+        if select:
+            queryset = queryset.select_related(*select)
+    queryset = queryset.prefetch_related(None).prefetch_related(*prefetch)
+
+    if not queryset.query.deferred_loading[0]:
+        # Foreign keys are always loaded, permissions and signals compare them
+        concrete = {field.name for field in opts.concrete_fields if field.is_relation or field.name in columns}
+        queryset = queryset.only(opts.pk.name, *concrete)
+    return queryset
+
+
+class FieldsetMixin:
+    """
+    Limit GET responses to the fields in ``?fields=`` and expand the relations in ``?expand=``
+    (see ``Meta.expandable_fields`` of the serializers) for serializers built by the view itself
+    """
+
+    def get_fieldset(self):
+        if self.request.method not in SAFE_METHODS:
+            return {}, {}
+        params = self.request.query_params
+        return parse_fieldset(params.get('fields', '')), parse_fieldset(params.get('expand', ''))
+
+    def limit_fields(self, serializer):
+        fields, expand = self.get_fieldset()
+        if fields or expand:
+            apply_fieldset(serializer, fields, expand)
+        return serializer
+
+    def prune_queryset(self, queryset, serializer):
+        fields, expand = self.get_fieldset()
+        if not (fields or expand):
+            return queryset
+        return prune_queryset(queryset, serializer)
+
+    def get_sparse_serializer(self, serializer_class, instance, **kwargs):
+        """
+        Instantiate a serializer with the fieldset applied and its queryset pruned
+        """
+        serializer = self.limit_fields(serializer_class(instance, **kwargs))
+        if isinstance(instance, QuerySet):
+            serializer.instance = self.prune_queryset(instance, serializer)
+        return serializer
+
+
+class SparseFieldsMixin(FieldsetMixin):
+    """
+    ``FieldsetMixin`` for generic views: applied to get_serializer() and the queryset is pruned
+    in filter_queryset() to what that serializer reads
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        return self.limit_fields(super().get_serializer(*args, **kwargs))
+
+    def _psq_resolving(self):
+        # drf-psq fetches the object to choose the serializer, so it can not be pruned by that serializer
+        return (isinstance(self, PsqMixin) and self._psq_check(self._psq_get_view())
+                and not hasattr(self, '_psq_permitted_rule'))
+
+    def prune_queryset(self, queryset, serializer=None):
+        if serializer is None:
+            if self._psq_resolving() or not any(self.get_fieldset()):
+                return queryset
+            serializer = self.get_serializer()
+        return super().prune_queryset(queryset, serializer)
+
+    def filter_queryset(self, queryset):
+        return self.prune_queryset(super().filter_queryset(queryset))
+
+
+class StreamingListMixin:
+    """
+    List rows one at a time into a streaming response when the client passes ``?stream=true``
+    and the negotiated renderer supports it. The serializer must use ``CompiledListSerializer``
+    """
+    stream_chunk_size = 500
+
+    def is_streaming(self):
+        return (self.request.query_params.get('stream') in ('1', 'true')
+                and hasattr(self.request.accepted_renderer, 'render_stream'))
+
+    def iter_rows(self, serializer, queryset):
+        return serializer.iter_representation(iterate_in_chunks(queryset, self.stream_chunk_size))
+
+    def get_streaming_response(self, data):
+        renderer = self.request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        return StreamingHttpResponse(renderer.render_stream(data), content_type=content_type)
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_streaming():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer(queryset, many=True)
+        return self.get_streaming_response(self.iter_rows(serializer, queryset))
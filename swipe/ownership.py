@@ -0,0 +1,64 @@
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import permissions
+
+from housing.models import ResidentialComplex
+
+COMPLEX_PREFIX = 'user-complex'
+# Cached for developers without a residential complex
+NO_COMPLEX = 0
+# Seconds the complex of a developer is cached, the signals forget it when the complex is saved,
+# reassigned or deleted and the timeout covers the bulk updates that send none
+COMPLEX_TIMEOUT = 60 * 60
+
+
+def complex_cache_key(user_id):
+    return f'{COMPLEX_PREFIX}:{user_id}'
+
+
+def forget_residential_complex(user_id):
+    transaction.on_commit(lambda: cache.delete(complex_cache_key(user_id)))
+
+
+def residential_complex_id(user):
+    """
+    Id of the residential complex of the developer ``user``, None for other users.
+    Kept on the user for the request and in the cache until the complex is saved or deleted
+    """
+    if not user.is_developer:
+        return None
+    if not hasattr(user, '_residential_complex_id'):
+        key = complex_cache_key(user.pk)
+        complex_id = cache.get(key)
+        if complex_id is None:
+            complex_id = ResidentialComplex.objects.filter(user_id=user.pk).values_list('id', flat=True).first()
+            complex_id = complex_id or NO_COMPLEX
+            cache.set(key, complex_id, timeout=COMPLEX_TIMEOUT)
+        user._residential_complex_id = complex_id or None
+    return user._residential_complex_id
+
+
+def resolve(obj, path):
+    for name in path.split('.'):
+        obj = getattr(obj, name)
+    return obj
+
+
+class OwnershipPermission(permissions.BasePermission):
+    """
+    Object permission decided from the foreign key ids loaded on the object, without queries.
+    ``user_path`` is the dotted path of the id of the owner, ``complex_path`` the path of the id
+    of the residential complex owning the object: the developer of that complex owns it.
+    Related objects on the paths should be loaded with ``select_related``
+    """
+    user_path = None
+    complex_path = None
+
+    def is_owner(self, user, obj):
+        if self.user_path is not None:
+            return resolve(obj, self.user_path) == user.pk
+        complex_id = residential_complex_id(user)
+        return complex_id is not None and resolve(obj, self.complex_path) == complex_id
+
+    def has_object_permission(self, request, view, obj):
+        return self.is_owner(request.user, obj)
@@ -0,0 +1,89 @@
+from collections.abc import Iterator
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _escape_line_separators(content):
+    # Same as JSONRenderer: U+2028 and U+2029 are valid JSON but break JavaScript
+    if b'\xe2\x80' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` backed by orjson. Decimal, datetime and the other types DRF knows
+    are encoded the same way as by the stock renderer; indented output falls back to it.
+    ``render_stream`` encodes iterators lazily for streaming responses
+    """
+    chunk_size = 64 * 1024
+
+    def __init__(self):
+        self.encoder = JSONEncoder()
+
+    def dumps(self, data):
+        return _escape_line_separators(orjson.dumps(data, default=self.encoder.default, option=ORJSON_OPTIONS))
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return self.dumps(data)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+    def iter_encode(self, data):
+        if isinstance(data, dict):
+            yield b'{'
+            for index, (key, value) in enumerate(data.items()):
+                yield (b',' if index else b'') + self.dumps(str(key)) + b':'
+                yield from self.iter_encode(value)
+            yield b'}'
+        elif isinstance(data, Iterator):
+            yield b'['
+            for index, item in enumerate(data):
+                yield (b',' if index else b'') + self.dumps(item)
+            yield b']'
+        else:
+            yield self.dumps(data)
+
+    def render_stream(self, data):
+        """
+        Yield the JSON of ``data`` in chunks of about ``chunk_size`` bytes.
+        Iterators anywhere in the top-level dicts are encoded one item at a time
+        """
+        buffer, size = [], 0
+        for piece in self.iter_encode(data):
+            buffer.append(piece)
+            size += len(piece)
+            if size >= self.chunk_size:
+                yield b''.join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield b''.join(buffer)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders the same data as ``ORJSONRenderer`` in the MessagePack binary format.
+    Values MessagePack has no type for (Decimal, datetime, lazy strings) are converted like in JSON
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def __init__(self):
+        self.encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self.encoder.default, use_bin_type=True)
@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+REPLICA = 'replica'
+PIN_PREFIX = 'pin-primary'
+# Actions of viewsets read from the replica, viewsets add theirs with ``replica_actions``
+READ_ACTIONS = ('list', 'retrieve')
+
+_replica_request = ContextVar('replica_request', default=None)
+
+
+def pin_cache_key(user_id):
+    return f'{PIN_PREFIX}:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """
+    Read the data of the user from the primary for ``REPLICA_PIN_TIMEOUT`` seconds after a write,
+    longer than the replication lag so the user sees his changes
+    """
+    cache.set(pin_cache_key(user_id), 1, timeout=settings.REPLICA_PIN_TIMEOUT)
+
+
+def is_pinned(user_id):
+    return cache.get(pin_cache_key(user_id)) is not None
+
+
+def is_read_action(view_func, method):
+    actions = getattr(view_func, 'actions', None)
+    if not actions:
+        return False
+    action = actions.get(method.lower())
+    return action in READ_ACTIONS or action in getattr(view_func.cls, 'replica_actions', ())
+
+
+def use_replica_for(request):
+    """
+    Route the reads of the current context to the replica for ``request``, None routes them to the primary
+    """
+    _replica_request.set(request)
+
+
+@contextmanager
+def read_from_primary():
+    """
+    Read from the primary inside the block, e.g. to fill caches keyed by versions of the primary
+    """
+    token = _replica_request.set(None)
+    try:
+        yield
+    finally:
+        _replica_request.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Reads of the read-only viewset actions marked by ``swipe.middleware.ReplicaMiddleware`` go to the
+    ``replica`` database when it is configured. The user is known once the view authenticated him,
+    the authentication itself and the users pinned after a write read the primary. Writes go to the primary
+    """
+
+    def db_for_read(self, model, **hints):
+        request = _replica_request.get()
+        if request is None or REPLICA not in settings.DATABASES:
+            return None
+        alias = getattr(request, 'read_database', False)
+        if alias is False:
+            user = getattr(request, 'user', None)
+            if user is None:
+                return None
+            alias = None if user.is_authenticated and is_pinned(user.pk) else REPLICA
+            request.read_database = alias
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
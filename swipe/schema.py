@@ -0,0 +1,28 @@
+from drf_spectacular import openapi
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+from .idempotency import IdempotentCreateMixin, IDEMPOTENCY_KEY_PARAMETER
+from .mixins import FieldsetMixin, FIELDS_PARAMETER, EXPAND_PARAMETER
+
+
+class AutoSchema(openapi.AutoSchema):
+    """
+    Documents the ``fields`` and ``expand`` parameters of views with ``FieldsetMixin``
+    and the ``Idempotency-Key`` header of views with ``IdempotentCreateMixin``
+    """
+
+    def get_override_parameters(self):
+        parameters = super().get_override_parameters()
+        if self.method == 'GET' and isinstance(self.view, FieldsetMixin):
+            parameters = [*parameters, FIELDS_PARAMETER, EXPAND_PARAMETER]
+        if self.method == 'POST' and isinstance(self.view, IdempotentCreateMixin):
+            parameters = [*parameters, IDEMPOTENCY_KEY_PARAMETER]
+        return parameters
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    target_class = 'swipe.authentication.CachedJWTAuthentication'
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    target_class = 'swipe.authentication.ClaimsJWTAuthentication'
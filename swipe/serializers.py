@@ -0,0 +1,292 @@
+from functools import lru_cache, partial
+
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject, PrimaryKeyRelatedField, ManyRelatedField
+from rest_framework.settings import api_settings
+
+_FAST_REPRESENTATIONS = {
+    serializers.IntegerField.to_representation: int,
+    serializers.CharField.to_representation: str,
+}
+
+
+def _is_stock(serializer, base):
+    return (type(serializer).to_representation is base.to_representation
+            and type(serializer).get_attribute is base.get_attribute)
+
+
+def _model_attribute(serializer, attr):
+    """
+    Return the model class attribute behind ``attr`` or None when the serializer is not a model serializer
+    """
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is None:
+        return None, None
+    try:
+        return model, model._meta.get_field(attr)
+    except FieldDoesNotExist:
+        return model, None
+
+
+def _generic_getter(field, instance):
+    attribute = field.get_attribute(instance)
+    if isinstance(attribute, PKOnlyObject) and attribute.pk is None:
+        return None
+    return attribute
+
+
+def _attribute_getter(field, attr, instance):
+    try:
+        return getattr(instance, attr)
+    except ObjectDoesNotExist:
+        return None
+    except (KeyError, AttributeError):
+        return _generic_getter(field, instance)
+
+
+def _prefetched_getter(field, cache_name, instance):
+    try:
+        return instance._prefetched_objects_cache[cache_name]
+    except (AttributeError, KeyError):
+        return _generic_getter(field, instance)
+
+
+def _prefetch_cache_name(model_field):
+    """
+    Return the key under which prefetch_related() stores the objects of a to-many relation
+    """
+    if model_field is None or not (model_field.one_to_many or model_field.many_to_many):
+        return None
+    if not model_field.auto_created:
+        return model_field.name
+    if model_field.many_to_many:
+        return model_field.field.related_query_name()
+    return model_field.get_cache_name()
+
+
+def _compile_getter(serializer, field):
+    """
+    Build ``instance -> attribute`` with the semantics of ``field.get_attribute``
+    """
+    get_attribute = type(field).get_attribute
+    if len(field.source_attrs) != 1 or get_attribute not in (
+            serializers.Field.get_attribute, ManyRelatedField.get_attribute
+    ):
+        return partial(_generic_getter, field)
+    attr = field.source_attrs[0]
+    model, model_field = _model_attribute(serializer, attr)
+    if model is None or (model_field is None and callable(getattr(model, attr, None))):
+        return partial(_generic_getter, field)
+    cache_name = _prefetch_cache_name(model_field)
+    if cache_name is not None:
+        return partial(_prefetched_getter, field, cache_name)
+    if get_attribute is ManyRelatedField.get_attribute:
+        return partial(_generic_getter, field)
+    return partial(_attribute_getter, field, attr)
+
+
+def _compile_primary_key_getter(serializer, field):
+    """
+    Read the foreign key column of a ``PrimaryKeyRelatedField`` directly, or None when it is not a plain FK
+    """
+    if (len(field.source_attrs) != 1 or field.pk_field is not None
+            or type(field).get_attribute is not PrimaryKeyRelatedField.get_attribute
+            or type(field).to_representation is not PrimaryKeyRelatedField.to_representation):
+        return None
+    _, model_field = _model_attribute(serializer, field.source_attrs[0])
+    if model_field is None or not model_field.concrete:
+        return None
+    return partial(_attribute_getter, field, model_field.attname)
+
+
+def _compile_field(serializer, field):
+    """
+    Return the ``(getter, representation)`` pair used to serialize ``field``
+    """
+    if isinstance(field, PrimaryKeyRelatedField):
+        getter = _compile_primary_key_getter(serializer, field)
+        if getter is not None:
+            return getter, _identity
+    return _compile_getter(serializer, field), _compile_representation(field)
+
+
+def _identity(value):
+    return value
+
+
+@lru_cache(maxsize=8192)
+def _storage_url(storage, base_url, name):
+    return storage.url(name)
+
+
+def _file_representation(field, value):
+    """
+    ``FileField.to_representation`` with the URLs of local files memoized, they only depend on the name
+    """
+    storage = getattr(value, 'storage', None)
+    if not value or not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL) or storage.__class__.url is not FileSystemStorage.url:
+        return field.to_representation(value)
+    url = _storage_url(storage, storage.base_url, value.name)
+    request = field.context.get('request', None)
+    if request is not None:
+        return request.build_absolute_uri(url)
+    return url
+
+
+def _compile_representation(field):
+    if (isinstance(field, serializers.ListSerializer)
+            and type(field).get_attribute is serializers.ListSerializer.get_attribute
+            and type(field).to_representation in (
+                serializers.ListSerializer.to_representation, CompiledListSerializer.to_representation
+            )):
+        child = compile_serializer(field.child)
+        return lambda data: [child(item) for item in (data.all() if isinstance(data, models.Manager) else data)]
+    if isinstance(field, serializers.Serializer):
+        return compile_serializer(field)
+    if (isinstance(field, ManyRelatedField) and type(field.child_relation) is PrimaryKeyRelatedField
+            and field.child_relation.pk_field is None):
+        return lambda iterable: [item.pk for item in iterable]
+    if type(field).to_representation is serializers.FileField.to_representation:
+        return partial(_file_representation, field)
+    return _FAST_REPRESENTATIONS.get(type(field).to_representation, field.to_representation)
+
+
+def compile_serializer(serializer):
+    """
+    Turn the readable fields of a bound serializer into a flat ``instance -> dict`` function
+    that gives the same output as ``serializer.to_representation``
+    """
+    if not _is_stock(serializer, serializers.Serializer):
+        return serializer.to_representation
+    plan = [(field.field_name, *_compile_field(serializer, field)) for field in serializer._readable_fields]
+
+    def to_representation(instance):
+        ret = {}
+        for name, getter, representation in plan:
+            try:
+                attribute = getter(instance)
+            except SkipField:
+                continue
+            ret[name] = None if attribute is None else representation(attribute)
+        return ret
+
+    return to_representation
+
+
+class CompiledListSerializer(serializers.ListSerializer):
+    """
+    ``many=True`` serializer which compiles the child fields once and reuses them for every row.
+    Enable with ``list_serializer_class = CompiledListSerializer`` in the serializer Meta
+    """
+
+    @cached_property
+    def compiled_child(self):
+        return compile_serializer(self.child)
+
+    def to_representation(self, data):
+        return list(self.iter_representation(data))
+
+    def iter_representation(self, data):
+        """
+        Lazily serialize ``data`` row by row, used for streaming responses
+        """
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        to_representation = self.compiled_child
+        return (to_representation(item) for item in iterable)
+
+
+def iterate_in_chunks(queryset, chunk_size=500):
+    """
+    Iterate over ``queryset`` in primary key order fetching ``chunk_size`` rows at a time.
+    Unlike ``QuerySet.iterator()`` prefetch_related() lookups are applied to every chunk
+    """
+    queryset = queryset.order_by('pk')
+    chunk = list(queryset[:chunk_size])
+    while chunk:
+        yield from chunk
+        if len(chunk) < chunk_size:
+            return
+        chunk = list(queryset.filter(pk__gt=chunk[-1].pk)[:chunk_size])
+
+
+def parse_fieldset(value):
+    """
+    Turn ``'id,creator.first_name'`` into ``{'id': {}, 'creator': {'first_name': {}}}``
+    """
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in filter(None, (name.strip() for name in path.split('.'))):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def _expanded_field(serializer, field, serializer_class):
+    if isinstance(serializer_class, str):
+        serializer_class = import_string(serializer_class)
+    _, model_field = _model_attribute(serializer, field.source)
+    many = model_field is not None and (model_field.one_to_many or model_field.many_to_many)
+    kwargs = {'source': field.source} if field.source != field.field_name else {}
+    return serializer_class(many=many, read_only=True, **kwargs)
+
+
+def apply_fieldset(serializer, fields, expand):
+    """
+    Keep only the ``fields`` tree of a bound serializer (all of them when it is empty) and
+    replace the fields named in the ``expand`` tree by the serializers in ``Meta.expandable_fields``.
+    Unknown names are ignored
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    if not isinstance(serializer, serializers.Serializer):
+        return
+    expandable = getattr(getattr(serializer, 'Meta', None), 'expandable_fields', {})
+    for name in expand:
+        if name in expandable and name in serializer.fields:
+            serializer.fields[name] = _expanded_field(serializer, serializer.fields[name], expandable[name])
+    if fields:
+        for name in [name for name in serializer.fields if name not in fields]:
+            del serializer.fields[name]
+    for name, field in serializer.fields.items():
+        if fields.get(name) or expand.get(name):
+            apply_fieldset(field, fields.get(name, {}), expand.get(name, {}))
+
+
+def fieldset_lookups(serializer):
+    """
+    Return the ``(columns, relations)`` read by the readable fields of ``serializer``: names of
+    model attributes and ``__`` separated paths of the relations whose objects are loaded.
+    None when some field reads something that is not a model attribute. ``Meta.field_lookups``
+    lists the attributes a field depends on, e.g. for properties
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    field_lookups = getattr(getattr(serializer, 'Meta', None), 'field_lookups', {})
+    columns, relations = set(), set()
+    for field in serializer._readable_fields:
+        if field.field_name in field_lookups:
+            names = field_lookups[field.field_name]
+        elif field.source == '*':
+            return None
+        else:
+            names = [field.source_attrs[0]]
+        for name in names:
+            _, model_field = _model_attribute(serializer, name)
+            if model_field is None:
+                return None
+            columns.add(model_field.name)
+            if not model_field.is_relation:
+                continue
+            if isinstance(field, serializers.BaseSerializer):
+                nested = fieldset_lookups(field)
+                relations.update(f'{model_field.name}__{path}' for path in (nested[1] if nested else ()))
+                relations.add(model_field.name)
+            elif field.field_name in field_lookups or isinstance(field, ManyRelatedField):
+                relations.add(model_field.name)
+    return columns, relations
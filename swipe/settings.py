@@ -28,6 +28,8 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'ads.apps.AdsConfig',
     'housing.apps.HousingConfig',
+    'benchmarks.apps.BenchmarksConfig',
+    'sync.apps.SyncConfig',
 
     # dop apps
     'django.contrib.sites',
@@ -50,16 +52,32 @@ INSTALLED_APPS += [
 ]
 
 REST_FRAMEWORK = {
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_SCHEMA_CLASS': 'swipe.schema.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'swipe.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'swipe.renderers.ORJSONRenderer',
+        'swipe.renderers.MessagePackRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'rest_framework.parsers.JSONParser',
+        'swipe.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'swipe.throttling.TokenBucketThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'complaint': '10/hour',
+        'message': '30/min',
+        'message_ip': '300/min',
+        'favorites': '60/min',
+    }
 
 }
 
@@ -77,6 +95,7 @@ REST_AUTH_REGISTER_SERIALIZERS = {
 }
 REST_AUTH_SERIALIZERS = {
     'LOGIN_SERIALIZER': 'users.serializers.CustomLoginSerializer',
+    'JWT_TOKEN_CLAIMS_SERIALIZER': 'swipe.tokens.RoleTokenObtainPairSerializer',
 }
 
 REST_SESSION_LOGIN = False
@@ -93,6 +112,7 @@ ACCOUNT_EMAIL_REQUIRED = True
 ACCOUNT_UNIQUE_EMAIL = True
 
 ACCOUNT_EMAIL_VERIFICATION = 'mandatory'
+ACCOUNT_ADAPTER = 'users.adapters.AccountAdapter'
 
 ACCOUNT_CONFIRM_EMAIL_ON_GET = True
 
@@ -115,16 +135,23 @@ EMAIL_HOST_USER = env('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD')
 EMAIL_USE_TLS = True
 
+# The HTML* middleware run only for the HTML pages, the JWT API skips them (see swipe.middleware.HTMLOnlyMixin)
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'swipe.middleware.ConnectionHealthMiddleware',
+    'swipe.middleware.CompressionMiddleware',
+    'swipe.middleware.HTMLSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'swipe.middleware.HTMLCsrfViewMiddleware',
+    'swipe.middleware.HTMLAuthenticationMiddleware',
+    'swipe.middleware.HTMLMessageMiddleware',
+    'swipe.middleware.ReplicaMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware'
 ]
+if DEBUG:
+    MIDDLEWARE += ['swipe.middleware.HTMLDebugToolbarMiddleware']
+
+HTML_PATH_PREFIXES = ['/admin/', '/accounts/', '/registration/', '/docs/', '/__debug__/']
 
 ROOT_URLCONF = 'swipe.urls'
 
@@ -146,6 +173,12 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'swipe.wsgi.application'
 
+# Scheme and host of the pages warmed by swipe.warming, the domain of the current Site by default
+WARM_CACHES_BASE_URL = env('WARM_CACHES_BASE_URL', default=None)
+
+# Serve the hot read endpoints by async views (see swipe.async_views), for the ASGI server
+ASYNC_READ_VIEWS = env.bool('ASYNC_READ_VIEWS', default=False)
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
@@ -161,7 +194,7 @@ INTERNAL_IPS = [
 #         'PASSWORD': env('DATABASE_PASS'),
 #         'HOST': env('HOST'),
 #         'PORT': env('PORT'),
-#         'ATOMIC_REQUEST': True,
+#         'ATOMIC_REQUESTS': True,
 #     }
 # }
 
@@ -173,9 +206,30 @@ DATABASES = {
         'PASSWORD': env('DATABASE_PASS_PROD'),
         'HOST': env('HOST_PROD'),
         'PORT': env('PORT_PROD'),
-        'ATOMIC_REQUEST': True,
+        'ATOMIC_REQUESTS': True,
+        # Connections are kept open between requests, checked by swipe.middleware.ConnectionHealthMiddleware
+        'CONN_MAX_AGE': env.int('CONN_MAX_AGE', default=60),
+        # Transaction pooling of pgbouncer (the pgbouncer service of docker-compose) can not keep server-side cursors
+        'DISABLE_SERVER_SIDE_CURSORS': env.bool('DATABASE_POOLER', default=False),
     }
 }
+# Seconds after which a persistent connection is checked before it is used again
+DATABASE_HEALTH_CHECK_INTERVAL = 10
+
+# Read-only viewset actions read from the replica (see swipe.routers). Locally it can be a second
+# Postgres container or the same database: DATABASE_REPLICA_HOST=db
+DATABASE_REPLICA_HOST = env('DATABASE_REPLICA_HOST', default=None)
+if DATABASE_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': DATABASE_REPLICA_HOST,
+        'PORT': env('DATABASE_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'ATOMIC_REQUESTS': False,
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['swipe.routers.ReplicaRouter']
+# Seconds a user reads from the primary after a write, longer than the replication lag
+REPLICA_PIN_TIMEOUT = 5
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -231,6 +285,21 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Europe/Kiev'
 
+# Cache (version stamps of the conditional requests live here and must be shared by all workers)
+CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://redis:6379/1',
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+        }
+    }
+}
+
+# Feed and complex pages: fresh for PAGE_CACHE_TIMEOUT, then served stale while rebuilt for PAGE_CACHE_STALE_TIMEOUT
+PAGE_CACHE_TIMEOUT = 60
+PAGE_CACHE_STALE_TIMEOUT = 300
+
 from datetime import timedelta
 
 SIMPLE_JWT = {
@@ -257,6 +326,7 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
     'TOKEN_USER_CLASS': 'rest_framework_simplejwt.models.TokenUser',
+    'TOKEN_OBTAIN_SERIALIZER': 'swipe.tokens.RoleTokenObtainPairSerializer',
 
     'JTI_CLAIM': 'jti',
 
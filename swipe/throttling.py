@@ -0,0 +1,116 @@
+from time import time
+
+from django.core.cache import cache
+from django_redis import get_redis_connection
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+THROTTLE_PREFIX = 'throttle'
+
+# KEYS[1] bucket, ARGV capacity and tokens per second. Returns 1 when a token was taken and the tokens
+# left, the clock of Redis is used so the time of the workers does not matter
+TAKE_TOKEN = '''
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'at')
+local tokens = tonumber(bucket[1]) or capacity
+local at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - at) * rate)
+local taken = 0
+if tokens >= 1 then
+    taken = 1
+    tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {taken, tostring(tokens)}
+'''
+
+
+def parse_rate(rate):
+    """
+    ``'<tokens>/<period>'`` as in DRF (``'10/min'``) to the capacity and the tokens refilled per second
+    """
+    tokens, period = rate.split('/')
+    tokens = int(tokens)
+    seconds = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+    return tokens, tokens / seconds
+
+
+class TokenBuckets:
+    """
+    Token buckets shared by all processes in Redis, changed by an atomic script so the limit holds
+    globally. Without Redis the buckets are kept in the cache
+    """
+
+    def __init__(self):
+        self.script = None
+
+    def take(self, key, capacity, rate):
+        """
+        Take a token from the bucket ``key``, return the seconds to wait for one or 0 if it was taken
+        """
+        try:
+            redis = get_redis_connection()
+        except NotImplementedError:
+            taken, left = self.take_from_cache(key, capacity, rate)
+        else:
+            if self.script is None:
+                self.script = redis.register_script(TAKE_TOKEN)
+            taken, left = self.script(keys=[key], args=[capacity, rate], client=redis)
+            left = float(left)
+        return 0 if taken else (1 - left) / rate
+
+    @staticmethod
+    def take_from_cache(key, capacity, rate):
+        now = time()
+        tokens, at = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + max(0, now - at) * rate)
+        taken = int(tokens >= 1)
+        cache.set(key, (tokens - taken, now), timeout=int(capacity / rate) + 1)
+        return taken, tokens - taken
+
+
+buckets = TokenBuckets()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle of the actions named in ``throttle_scopes`` of the view (``{'create': 'complaint'}``).
+    The rate of a scope is ``DEFAULT_THROTTLE_RATES[scope]`` per user, anonymous users are limited
+    per IP. ``DEFAULT_THROTTLE_RATES[f'{scope}_ip']`` adds a bucket per IP for all users.
+    A scope without a rate is not throttled
+    """
+
+    def __init__(self):
+        self.wait_time = None
+
+    def get_scope(self, view):
+        return getattr(view, 'throttle_scopes', {}).get(getattr(view, 'action', None))
+
+    def get_buckets(self, request, scope):
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        ip_rate = rates.get(f'{scope}_ip')
+        if request.user and request.user.is_authenticated:
+            if rates.get(scope):
+                yield f'{THROTTLE_PREFIX}:{scope}:user:{request.user.pk}', rates[scope]
+            if ip_rate:
+                yield f'{THROTTLE_PREFIX}:{scope}:ip:{self.get_ident(request)}', ip_rate
+        elif ip_rate or rates.get(scope):
+            yield f'{THROTTLE_PREFIX}:{scope}:ip:{self.get_ident(request)}', ip_rate or rates[scope]
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(view)
+        if scope is None:
+            return True
+        for key, rate in self.get_buckets(request, scope):
+            wait_time = buckets.take(key, *parse_rate(rate))
+            if wait_time:
+                self.wait_time = wait_time
+                return False
+        return True
+
+    def wait(self):
+        return self.wait_time
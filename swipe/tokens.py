@@ -0,0 +1,22 @@
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+# User flags copied into the tokens for ClaimsJWTAuthentication
+ROLE_CLAIMS = ['is_staff', 'is_superuser', 'is_developer', 'is_blacklist']
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class RoleTokenObtainPairView(TokenObtainPairView):
+    serializer_class = RoleTokenObtainPairSerializer
+
+    def get_serializer_class(self):
+        return self.serializer_class
@@ -4,6 +4,7 @@ from django.urls import path, include
 from django.contrib import admin
 from django.conf import settings
 import debug_toolbar
+from swipe.batch import BatchView
 
 urlpatterns = [
 
@@ -11,11 +12,13 @@ urlpatterns = [
 
     # api
     path('api/', include('swipe.api-urls')),
+    path('batch/', BatchView.as_view(), name='batch'),
 
     # apps
     path('', include('users.urls', namespace='users')),
     path('ads/', include('ads.urls', namespace='ads')),
     path('housing/', include('housing.urls', namespace='housing')),
+    path('sync/', include('sync.urls', namespace='sync')),
 
     # drf-spectacular
     path('docs/schema/', SpectacularAPIView.as_view(), name='schema'),
@@ -0,0 +1,89 @@
+from functools import wraps
+from hashlib import sha1
+from time import time_ns
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .routers import read_from_primary
+
+VERSION_PREFIX = 'version'
+
+
+def version_key(name, pk=None):
+    """
+    Cache key of the version stamp of a whole model (``pk=None``) or of one object
+    """
+    return f'{VERSION_PREFIX}:{name}' if pk is None else f'{VERSION_PREFIX}:{name}:{pk}'
+
+
+def bump_versions(keys):
+    """
+    Give ``keys`` new stamps once the current transaction commits.
+    A stamp is the time of the change in microseconds
+    """
+    keys = list(keys)
+    if keys:
+        transaction.on_commit(lambda: cache.set_many(dict.fromkeys(keys, time_ns() // 1000), timeout=None))
+
+
+def get_versions(keys):
+    """
+    Return the stamps of ``keys``, keys missing from the cache get the current time
+    """
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        stamp = time_ns() // 1000
+        for key in missing:
+            cache.add(key, stamp, timeout=None)
+        versions.update(cache.get_many(missing))
+    return [versions[key] for key in keys]
+
+
+def replica_caught_up(stamps):
+    """
+    Whether the replica has the changes of ``stamps``, it lags less than ``REPLICA_PIN_TIMEOUT`` seconds
+    """
+    return time_ns() // 1000 - max(stamps) >= settings.REPLICA_PIN_TIMEOUT * 1_000_000
+
+
+def versioned(get_keys):
+    """
+    Decorate a GET view method with ETag and Last-Modified headers derived from the version
+    stamps of ``get_keys(view, request, *args, **kwargs)`` and answer conditional requests
+    with 304 Not Modified before the method runs. The stamps are left in ``view.version_stamps``.
+    The stamps are committed on the primary, the method reads from the primary while a stamp is younger
+    than the replication lag so a lagging replica does not serve an older body under the new ETag
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return method(view, request, *args, **kwargs)
+            stamps = view.version_stamps = get_versions(get_keys(view, request, *args, **kwargs))
+            # The body also depends on who asks, the query string and the negotiated format
+            etag = quote_etag(sha1(repr((
+                stamps, request.user.pk, request.build_absolute_uri(), request.accepted_media_type
+            )).encode()).hexdigest())
+            last_modified = max(stamps) // 1_000_000
+            response = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+            if response is None and replica_caught_up(stamps):
+                response = method(view, request, *args, **kwargs)
+            elif response is None:
+                # PsqMixin keeps the object its permission check loaded, possibly from the replica
+                view.__dict__.pop('obj', None)
+                with read_from_primary():
+                    response = method(view, request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response['ETag'] = etag
+                response['Last-Modified'] = http_date(last_modified)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sites.models import Site
+from django.db import connections, transaction
+from django.urls import resolve, reverse
+
+from housing.models import ResidentialComplex
+from sync.models import PopularPage
+from .batch import build_request
+from .caching import popular_page_scores, popular_pages, trim_popular_pages
+
+User = get_user_model()
+
+
+def _request_meta(uri):
+    url = urlsplit(uri)
+    port = url.port or (443 if url.scheme == 'https' else 80)
+    meta = {'HTTP_HOST': url.netloc, 'SERVER_NAME': url.hostname, 'SERVER_PORT': str(port)}
+    if url.scheme == 'https' and settings.SECURE_PROXY_SSL_HEADER:
+        header, value = settings.SECURE_PROXY_SSL_HEADER
+        meta[header] = value
+    return meta
+
+
+def warm_page(uri, user):
+    """
+    Request ``uri`` in-process as ``user`` so the view fills its page cache, return the status code
+    """
+    url = urlsplit(uri)
+    match = resolve(url.path)
+    request = build_request(_request_meta(uri), 'GET', f'{url.path}?{url.query}' if url.query else url.path, user=user)
+    return match.func(request, *match.args, **match.kwargs).status_code
+
+
+def _warm_page_in_thread(uri, user):
+    try:
+        return warm_page(uri, user)
+    finally:
+        connections.close_all()
+
+
+def default_base_url():
+    """
+    ``WARM_CACHES_BASE_URL`` or the domain of the current ``Site``
+    """
+    if settings.WARM_CACHES_BASE_URL:
+        return settings.WARM_CACHES_BASE_URL.rstrip('/')
+    scheme = 'https' if settings.SECURE_PROXY_SSL_HEADER else 'http'
+    return f'{scheme}://{Site.objects.get_current().domain}'
+
+
+def load_popular_pages(name, limit):
+    """
+    The most requested URIs of the ``name`` page counted in Redis, the counts saved in the database
+    when Redis was flushed
+    """
+    return popular_pages(name, limit) or list(
+        PopularPage.objects.filter(name=name).order_by('-score', 'id').values_list('uri', flat=True)[:limit]
+    )
+
+
+def save_popular_pages(name, keep):
+    """
+    Replace the saved counts of the ``name`` page with the ``keep`` highest counts of Redis
+    """
+    scores = popular_page_scores(name, keep)
+    if not scores:
+        # Redis was flushed or is not used, the saved counts are all there is
+        return
+    with transaction.atomic():
+        PopularPage.objects.filter(name=name).delete()
+        PopularPage.objects.bulk_create([PopularPage(name=name, uri=uri, score=score) for uri, score in scores])
+
+
+def pages_to_warm(feed_pages, base_url=None):
+    """
+    The ``feed_pages`` most requested feed pages (the first page without counts), the detail of every
+    residential complex and the notary list on ``base_url``, ``default_base_url()`` when it is None
+    """
+    base_url = base_url or default_base_url()
+    feeds = load_popular_pages('feed', feed_pages) or [base_url + reverse('ads:announcement-feed-list')]
+    complexes = [
+        base_url + reverse('housing:residential-complex-detail', args=[pk])
+        for pk in ResidentialComplex.objects.order_by('id').values_list('id', flat=True)
+    ]
+    return [*feeds, *complexes, base_url + reverse('users:notary-list')]
+
+
+def warm_caches(feed_pages=50, base_url=None, workers=4, keep_popular=1000):
+    """
+    Fill the page caches on a cold start, ``workers`` pages are requested at once.
+    Return ``{uri: status code}``
+    """
+    user = User.objects.filter(is_superuser=True, is_active=True).order_by('id').first()
+    if user is None:
+        return {}
+    uris = pages_to_warm(feed_pages, base_url)
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            statuses = list(executor.map(lambda uri: _warm_page_in_thread(uri, user), uris))
+    else:
+        statuses = [warm_page(uri, user) for uri in uris]
+    for name in ('feed', 'residential_complex', 'notary'):
+        trim_popular_pages(name, keep_popular)
+        save_popular_pages(name, keep_popular)
+    return dict(zip(uris, statuses))
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import Change, Event, PopularPage
+
+# Register your models here.
+
+admin.site.register(Change)
+admin.site.register(Event)
+admin.site.register(PopularPage)
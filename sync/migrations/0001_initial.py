@@ -0,0 +1,31 @@
+# Generated by Django 3.2.14 on 2026-10-19 01:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('announcement', 'Объявление'), ('residential_complex', 'ЖК'), ('favorite_announcement', 'Избранное объявление'), ('favorite_residential_complex', 'Избранный ЖК'), ('message', 'Сообщение')], max_length=28)),
+                ('object_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('updated', 'Создан или изменен'), ('deleted', 'Удален')], max_length=7)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(blank=True, help_text='Only this user sees the change, everybody when empty', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='changes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('id',),
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.14 on 2026-10-19 02:12
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Event',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(choices=[('announcement_moderated', 'Объявление прошло модерацию'), ('announcement_price_changed', 'Изменена цена объявления'), ('advertising_activated', 'Продвижение активировано'), ('apartment_booked', 'Квартира забронирована'), ('message_sent', 'Сообщение отправлено')], max_length=32)),
+                ('aggregate', models.CharField(choices=[('announcement', 'Объявление'), ('residential_complex', 'ЖК'), ('favorite_announcement', 'Избранное объявление'), ('favorite_residential_complex', 'Избранный ЖК'), ('message', 'Сообщение')], max_length=28)),
+                ('aggregate_id', models.BigIntegerField()),
+                ('payload', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('date_published', models.DateTimeField(blank=True, null=True)),
+                ('date_processed', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ('id',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('date_processed__isnull', True)), fields=['aggregate', 'aggregate_id', 'id'], name='sync_event_pending'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 3.2.14 on 2026-10-19 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0002_event'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='sync_event_pending',
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Deliveries to the handlers'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='date_failed',
+            field=models.DateTimeField(blank=True, help_text='Dead-lettered after too many failed deliveries', null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='error',
+            field=models.TextField(blank=True, help_text='Error of the last failed delivery'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('date_failed__isnull', True), ('date_processed__isnull', True)), fields=['aggregate', 'aggregate_id', 'id'], name='sync_event_pending'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date_processed'], name='sync_event_processed'),
+        ),
+    ]
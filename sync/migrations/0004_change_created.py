@@ -0,0 +1,17 @@
+# Generated by Django 3.2.14 on 2026-10-19 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0003_event_attempts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(fields=['date_created'], name='sync_change_created'),
+        ),
+    ]
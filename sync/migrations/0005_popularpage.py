@@ -0,0 +1,25 @@
+# Generated by Django 3.2.14 on 2026-10-19 02:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0004_change_created'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PopularPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32)),
+                ('uri', models.CharField(max_length=2000)),
+                ('score', models.FloatField()),
+            ],
+            options={
+                'ordering': ('name', '-score'),
+            },
+        ),
+    ]
@@ -0,0 +1,102 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+User = settings.AUTH_USER_MODEL
+
+
+# Create your models here.
+
+class Change(models.Model):
+    """
+    Append-only log of changes, its id is the sync token of the clients
+    """
+
+    class Kind(models.TextChoices):
+        ANNOUNCEMENT = 'announcement', _('Объявление')
+        RESIDENTIAL_COMPLEX = 'residential_complex', _('ЖК')
+        FAVORITE_ANNOUNCEMENT = 'favorite_announcement', _('Избранное объявление')
+        FAVORITE_RESIDENTIAL_COMPLEX = 'favorite_residential_complex', _('Избранный ЖК')
+        MESSAGE = 'message', _('Сообщение')
+
+    class Action(models.TextChoices):
+        UPDATED = 'updated', _('Создан или изменен')
+        DELETED = 'deleted', _('Удален')
+
+    kind = models.CharField(max_length=28, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=7, choices=Action.choices)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='changes', null=True, blank=True,
+        help_text='Only this user sees the change, everybody when empty'
+    )
+    date_created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('id',)
+        indexes = [
+            # The window read again before a token and the pruning
+            models.Index(fields=['date_created'], name='sync_change_created'),
+        ]
+
+
+class EventQuerySet(models.QuerySet):
+
+    def pending(self):
+        """
+        Events neither processed nor dead-lettered
+        """
+        return self.filter(date_processed__isnull=True, date_failed__isnull=True)
+
+
+class Event(models.Model):
+    """
+    Outbox of domain events, written in the transaction of the change and published to Celery by
+    ``sync.services.events.relay_events``. Events of one aggregate are handled in the order of their ids
+    """
+
+    class Name(models.TextChoices):
+        ANNOUNCEMENT_MODERATED = 'announcement_moderated', _('Объявление прошло модерацию')
+        ANNOUNCEMENT_PRICE_CHANGED = 'announcement_price_changed', _('Изменена цена объявления')
+        ADVERTISING_ACTIVATED = 'advertising_activated', _('Продвижение активировано')
+        APARTMENT_BOOKED = 'apartment_booked', _('Квартира забронирована')
+        MESSAGE_SENT = 'message_sent', _('Сообщение отправлено')
+
+    name = models.CharField(max_length=32, choices=Name.choices)
+    aggregate = models.CharField(max_length=28, choices=Change.Kind.choices)
+    aggregate_id = models.BigIntegerField()
+    payload = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    date_created = models.DateTimeField(auto_now_add=True)
+    date_published = models.DateTimeField(null=True, blank=True)
+    date_processed = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0, help_text='Deliveries to the handlers')
+    error = models.TextField(blank=True, help_text='Error of the last failed delivery')
+    date_failed = models.DateTimeField(
+        null=True, blank=True, help_text='Dead-lettered after too many failed deliveries'
+    )
+
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        ordering = ('id',)
+        indexes = [
+            # The relay only scans the pending events
+            models.Index(
+                fields=['aggregate', 'aggregate_id', 'id'], name='sync_event_pending',
+                condition=models.Q(date_processed__isnull=True, date_failed__isnull=True)
+            ),
+            models.Index(fields=['date_processed'], name='sync_event_processed'),
+        ]
+
+
+class PopularPage(models.Model):
+    """
+    Request counts of the cached pages copied from Redis by the cache warmer, they survive a flush of Redis
+    """
+    name = models.CharField(max_length=32)
+    uri = models.CharField(max_length=2000)
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ('name', '-score')
@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from sync.models import Change
+
+# Seconds before the change of a token whose changes are read again: ids are taken at the insert and become
+# visible at the commit, a transaction of a longer request can commit a lower id after a client synced past it
+SYNC_WINDOW = 120
+# Seconds changes are kept for, clients with an older token have to sync again without a token
+CHANGE_RETENTION = 30 * 24 * 60 * 60
+
+
+class SyncTokenExpired(Exception):
+    pass
+
+
+def record_changes(kind, object_ids, action=Change.Action.UPDATED, user_ids=(None,)):
+    """
+    Append a change of every object for every user (None means a change visible to everybody)
+    """
+    Change.objects.bulk_create([
+        Change(kind=kind, object_id=object_id, action=action, user_id=user_id)
+        for object_id in object_ids
+        for user_id in user_ids
+    ])
+
+
+def collect_changes(user_id, token, limit):
+    """
+    Return the changes visible to the user after ``token`` as ``{kind: {object_id: action}}``
+    keeping the last action of every object, the new token and whether more changes are left.
+    The changes of the ``SYNC_WINDOW`` seconds before the token are returned again, clients
+    apply them idempotently. Raises ``SyncTokenExpired`` when the change of the token was pruned
+    """
+    visible = Change.objects.filter(Q(user_id=user_id) | Q(user__isnull=True))
+    fields = ('id', 'kind', 'object_id', 'action')
+    late = []
+    if token:
+        token_created = Change.objects.filter(id=token).values_list('date_created', flat=True).first()
+        if token_created is None:
+            raise SyncTokenExpired
+        late = list(
+            visible.filter(
+                id__lte=token, date_created__gte=token_created - timedelta(seconds=SYNC_WINDOW)
+            ).order_by('id').values_list(*fields)
+        )
+    changes = list(visible.filter(id__gt=token).order_by('id').values_list(*fields)[:limit + 1])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    collected = {kind: {} for kind in Change.Kind.values}
+    for _, kind, object_id, action in late + changes:
+        collected[kind][object_id] = action
+    return collected, changes[-1][0] if changes else token, has_more
+
+
+def prune_changes(retention=CHANGE_RETENTION):
+    """
+    Delete the changes older than ``retention`` seconds, the tokens pointing at them expire
+    """
+    deleted, _ = Change.objects.filter(date_created__lt=timezone.now() - timedelta(seconds=retention)).delete()
+    return deleted
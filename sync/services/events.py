@@ -0,0 +1,142 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from sync.models import Event
+
+# Events published to Celery by one run of the relay
+RELAY_BATCH_SIZE = 100
+# Seconds after which the published events not processed yet are published again
+RELAY_RETRY = 60
+# Deliveries of an event before it is dead-lettered
+RELAY_MAX_ATTEMPTS = 5
+# Key of the advisory lock that lets one relay run at a time
+RELAY_LOCK_ID = 4049
+# Seconds processed events are kept for
+EVENT_RETENTION = 7 * 24 * 60 * 60
+# Seconds a commit with events does not queue the relay again, the beat schedule runs it anyway
+RELAY_KICK_TIMEOUT = 1
+RELAY_KICK_KEY = 'events-relay-kick'
+
+_handlers = defaultdict(list)
+
+
+def subscribe(*names):
+    """
+    Register the decorated function as a handler of the events ``names``, it is called with the event.
+    Events are delivered at least once, handlers must be idempotent
+    """
+    def decorator(handler):
+        for name in names:
+            _handlers[name].append(handler)
+        return handler
+    return decorator
+
+
+def _kick_relay():
+    from sync.tasks import relay_events
+
+    if cache.add(RELAY_KICK_KEY, 1, timeout=RELAY_KICK_TIMEOUT):
+        relay_events.delay()
+
+
+def publish_event(name, aggregate, aggregate_id, **payload):
+    """
+    Write the event to the outbox in the current transaction, it is published once the change is
+    committed and dropped with it on a rollback. ``aggregate`` is a ``Change.Kind``
+    """
+    event = Event.objects.create(name=name, aggregate=aggregate, aggregate_id=aggregate_id, payload=payload)
+    transaction.on_commit(_kick_relay)
+    return event
+
+
+def _lock_relay():
+    """
+    Take the transaction-level advisory lock of the relay, False when another relay holds it. Relays run
+    one at a time so a relay never publishes events of an aggregate that another one has not committed yet
+    """
+    if connection.vendor != 'postgresql':
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_xact_lock(%s)', [RELAY_LOCK_ID])
+        return cursor.fetchone()[0]
+
+
+def relay_events(batch_size=RELAY_BATCH_SIZE):
+    """
+    Publish a batch of pending events, one ``process_events`` task per aggregate with its events in order.
+    An aggregate with events in flight is skipped until they are processed or ``RELAY_RETRY`` passes,
+    so a later event never overtakes an earlier one. An event delivered ``RELAY_MAX_ATTEMPTS`` times
+    without being processed is dead-lettered (``date_failed``) and no longer holds back its aggregate.
+    Returns the number of published events
+    """
+    from sync.tasks import process_events
+
+    now = timezone.now()
+    retry_before = now - timedelta(seconds=RELAY_RETRY)
+    in_flight = Event.objects.pending().filter(
+        aggregate=OuterRef('aggregate'), aggregate_id=OuterRef('aggregate_id'), date_published__gte=retry_before
+    )
+    with transaction.atomic():
+        if not _lock_relay():
+            return 0
+        Event.objects.pending().filter(
+            attempts__gte=RELAY_MAX_ATTEMPTS, date_published__lt=retry_before
+        ).update(date_failed=now)
+        events = list(
+            Event.objects.pending()
+            .exclude(Exists(in_flight))
+            .order_by('id')
+            .values_list('id', 'aggregate', 'aggregate_id')[:batch_size]
+        )
+        if not events:
+            return 0
+        aggregates = defaultdict(list)
+        for event_id, aggregate, aggregate_id in events:
+            aggregates[aggregate, aggregate_id].append(event_id)
+        Event.objects.filter(id__in=[event_id for event_id, _, _ in events]).update(date_published=now)
+        # Only the first event of an aggregate is surely tried, the ones after it wait for it to succeed
+        Event.objects.filter(id__in=[event_ids[0] for event_ids in aggregates.values()]).update(
+            attempts=F('attempts') + 1
+        )
+
+        def publish():
+            for event_ids in aggregates.values():
+                process_events.delay(event_ids)
+
+        # A crash before the tasks are queued leaves the events to the next run after RELAY_RETRY
+        transaction.on_commit(publish)
+    return len(events)
+
+
+def process_events(event_ids):
+    """
+    Call the handlers of the events in order and mark them processed, an error is kept on the event and
+    stops at it, the relay publishes it again with the ones after it. The row of the event is locked
+    so a redelivery running at the same time waits and skips it
+    """
+    for event_id in event_ids:
+        try:
+            with transaction.atomic():
+                event = Event.objects.pending().select_for_update().filter(id=event_id).first()
+                if event is None:
+                    continue
+                for handler in _handlers[event.name]:
+                    handler(event)
+                Event.objects.filter(id=event.id).update(date_processed=timezone.now(), error='')
+        except Exception as error:
+            Event.objects.filter(id=event_id).update(error=repr(error))
+            raise
+
+
+def prune_events(retention=EVENT_RETENTION):
+    """
+    Delete the events processed more than ``retention`` seconds ago, the dead-lettered ones are kept
+    """
+    processed_before = timezone.now() - timedelta(seconds=retention)
+    deleted, _ = Event.objects.filter(date_processed__lt=processed_before).delete()
+    return deleted
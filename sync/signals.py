@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.dispatch import receiver
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from ads.models import Announcement, Advertising, Apartment, GalleryAnnouncement
+from housing.models import ResidentialComplex, GalleryResidentialComplex
+from users.models import Message
+from sync.models import Change
+from sync.services.changes import record_changes
+
+User = get_user_model()
+
+
+def _action(signal):
+    return Change.Action.DELETED if signal is post_delete else Change.Action.UPDATED
+
+
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+def announcement_changed(instance, signal, **kwargs):
+    record_changes(Change.Kind.ANNOUNCEMENT, [instance.id], _action(signal))
+
+
+@receiver(post_save, sender=Advertising)
+@receiver(post_delete, sender=Advertising)
+@receiver(post_save, sender=Apartment)
+@receiver(post_delete, sender=Apartment)
+@receiver(post_save, sender=GalleryAnnouncement)
+@receiver(post_delete, sender=GalleryAnnouncement)
+def announcement_part_changed(instance, **kwargs):
+    record_changes(Change.Kind.ANNOUNCEMENT, [instance.announcement_id])
+
+
+@receiver(post_save, sender=ResidentialComplex)
+@receiver(post_delete, sender=ResidentialComplex)
+def residential_complex_changed(instance, signal, **kwargs):
+    record_changes(Change.Kind.RESIDENTIAL_COMPLEX, [instance.id], _action(signal))
+
+
+@receiver(post_save, sender=GalleryResidentialComplex)
+@receiver(post_delete, sender=GalleryResidentialComplex)
+def residential_complex_gallery_changed(instance, **kwargs):
+    record_changes(Change.Kind.RESIDENTIAL_COMPLEX, [instance.residential_complex_id])
+
+
+@receiver(post_save, sender=Message)
+@receiver(post_delete, sender=Message)
+def message_changed(instance, signal, **kwargs):
+    # Messages to the support have no recipient, None would make the change visible to everybody
+    user_ids = {instance.sender_id, instance.recipient_id} - {None}
+    record_changes(Change.Kind.MESSAGE, [instance.id], _action(signal), user_ids)
+
+
+def _favorites_changed(instance, action, reverse, pk_set, field_name, related_name, kind, favorite_kind):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if action == 'pre_clear':
+        pk_set = set(getattr(instance, related_name if reverse else field_name).values_list('pk', flat=True))
+    user_ids, object_ids = (pk_set, [instance.pk]) if reverse else ([instance.pk], pk_set)
+    change_action = Change.Action.UPDATED if action == 'post_add' else Change.Action.DELETED
+    for user_id in user_ids:
+        record_changes(favorite_kind, object_ids, change_action, [user_id])
+    # The lists of the objects show who added them to favorites
+    record_changes(kind, object_ids)
+
+
+@receiver(m2m_changed, sender=User.favorites_announcement.through)
+def favorites_announcement_changed(instance, action, reverse, pk_set, **kwargs):
+    _favorites_changed(
+        instance, action, reverse, pk_set, 'favorites_announcement', 'favorite_announcement',
+        Change.Kind.ANNOUNCEMENT, Change.Kind.FAVORITE_ANNOUNCEMENT
+    )
+
+
+@receiver(m2m_changed, sender=User.favorites_residential_complex.through)
+def favorites_residential_complex_changed(instance, action, reverse, pk_set, **kwargs):
+    _favorites_changed(
+        instance, action, reverse, pk_set, 'favorites_residential_complex', 'favorite_complex',
+        Change.Kind.RESIDENTIAL_COMPLEX, Change.Kind.FAVORITE_RESIDENTIAL_COMPLEX
+    )
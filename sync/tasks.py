@@ -0,0 +1,40 @@
+from swipe.celery import app
+from .services.changes import prune_changes as prune_change_log
+from .services.events import RELAY_BATCH_SIZE
+from .services.events import process_events as process_outbox_events, relay_events as relay_outbox_events
+from .services.events import prune_events as prune_outbox_events
+
+
+@app.task
+def relay_events():
+    """
+    Publish the pending events of the outbox, queued after commits with events and by the beat schedule
+    """
+    while relay_outbox_events() == RELAY_BATCH_SIZE:
+        pass
+
+
+@app.task
+def process_events(event_ids):
+    """
+    Deliver the events of one aggregate to their handlers in order
+    """
+    process_outbox_events(event_ids)
+
+
+@app.task
+def prune_events():
+    """
+    Delete the old processed events of the outbox
+    """
+    deleted = prune_outbox_events()
+    print(f'task "prune_events" complete, {deleted} events')
+
+
+@app.task
+def prune_changes():
+    """
+    Delete the changes older than the retention of the sync log
+    """
+    deleted = prune_change_log()
+    print(f'task "prune_changes" complete, {deleted} changes')
@@ -0,0 +1,177 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+# Create your tests here.
+from ads.models import Announcement
+from users.models import Message
+from swipe.celery import app
+from sync.models import Change, Event
+from sync.services import events
+from sync.services.changes import CHANGE_RETENTION, SYNC_WINDOW, prune_changes
+from sync.services.events import RELAY_MAX_ATTEMPTS, RELAY_RETRY, prune_events, publish_event, relay_events
+
+User = get_user_model()
+
+
+class SyncTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(
+            email='admin@admin.com',
+            first_name='Test',
+            last_name='Test',
+        )
+        self.user.set_password('Zaqwerty123')
+        self.user.save()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('sync:sync')
+
+    def create_announcement(self):
+        return Announcement.objects.create(
+            address='Адрес', description='Описание', area=54.5, area_kitchen=12, price=42000,
+            creator=self.user
+        )
+
+    def test_sync_changes_after_token(self):
+        response = self.client.get(self.url)
+        assert response.status_code == 200
+        token = response.json()['token']
+
+        announcement = self.create_announcement()
+        deleted = self.create_announcement()
+        deleted_id = deleted.id
+        deleted.delete()
+        self.user.favorites_announcement.add(announcement)
+
+        response = self.client.get(self.url, {'token': token})
+        assert response.status_code == 200
+        data = response.json()
+        assert [obj['id'] for obj in data['announcement']['updated']] == [announcement.id]
+        assert data['announcement']['deleted'] == [deleted_id]
+        assert data['favorite_announcement'] == {'updated': [announcement.id], 'deleted': []}
+        assert data['has_more'] is False
+
+        # The changes just before the token are returned again until they leave the window
+        response = self.client.get(self.url, {'token': data['token']})
+        assert response.json()['announcement']['deleted'] == [deleted_id]
+        Change.objects.update(date_created=timezone.now() - timedelta(seconds=SYNC_WINDOW + 1))
+        Change.objects.filter(id=data['token']).update(date_created=timezone.now())
+        response = self.client.get(self.url, {'token': data['token']})
+        assert response.json()['announcement']['deleted'] == []
+        assert response.json()['favorite_announcement'] == {'updated': [], 'deleted': []}
+
+    def test_sync_returns_changes_committed_late(self):
+        token = self.client.get(self.url).json()['token']
+        announcement = self.create_announcement()
+        data = self.client.get(self.url, {'token': token}).json()
+        # A transaction took an id below the token before the sync and committed after it
+        late_id = Change.objects.filter(id__gt=token).order_by('id').values_list('id', flat=True).first()
+        Change.objects.filter(id=late_id).delete()
+        Change.objects.create(
+            id=late_id, kind=Change.Kind.FAVORITE_ANNOUNCEMENT, object_id=announcement.id,
+            action=Change.Action.UPDATED, user=self.user
+        )
+        response = self.client.get(self.url, {'token': data['token']})
+        assert response.json()['favorite_announcement'] == {'updated': [announcement.id], 'deleted': []}
+
+    def test_sync_expired_token(self):
+        self.create_announcement()
+        token = self.client.get(self.url).json()['token']
+        Change.objects.update(date_created=timezone.now() - timedelta(seconds=CHANGE_RETENTION + 1))
+        assert prune_changes() > 0
+        response = self.client.get(self.url, {'token': token})
+        assert response.status_code == 410
+
+    def test_sync_support_message_visible_to_sender_only(self):
+        token = self.client.get(self.url).json()['token']
+        other = User.objects.create(email='other@admin.com')
+        message = Message.objects.create(text='Вопрос', is_feedback=True, sender=other)
+        message_id = message.id
+        message.delete()
+
+        assert self.client.get(self.url, {'token': token}).json()['message'] == {'updated': [], 'deleted': []}
+        self.client.force_authenticate(user=other)
+        assert self.client.get(self.url, {'token': token}).json()['message'] == {
+            'updated': [], 'deleted': [message_id]
+        }
+
+    def test_sync_invalid_token(self):
+        response = self.client.get(self.url, {'token': 'abc'})
+        assert response.status_code == 400
+
+
+class EventOutboxTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        app.conf.update(task_always_eager=True)
+        self.addCleanup(app.conf.update, task_always_eager=False)
+        self.handled = []
+        self.failing = False
+        patcher = mock.patch.dict(events._handlers, {Event.Name.MESSAGE_SENT: [self.handle]})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def handle(self, event):
+        if self.failing:
+            raise RuntimeError('Handler failed')
+        self.handled.append((event.aggregate_id, event.payload['n']))
+
+    def publish(self, aggregate_id, n):
+        return publish_event(Event.Name.MESSAGE_SENT, Change.Kind.MESSAGE, aggregate_id, n=n)
+
+    def relay(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return relay_events()
+
+    def test_events_handled_in_order_per_aggregate(self):
+        for aggregate_id, n in [(1, 1), (2, 2), (1, 3), (2, 4)]:
+            self.publish(aggregate_id, n)
+        assert self.relay() == 4
+        assert [n for aggregate_id, n in self.handled if aggregate_id == 1] == [1, 3]
+        assert [n for aggregate_id, n in self.handled if aggregate_id == 2] == [2, 4]
+        assert not Event.objects.filter(date_processed__isnull=True).exists()
+        assert self.relay() == 0
+
+    def test_failed_event_is_published_again(self):
+        self.publish(1, 1)
+        self.publish(1, 2)
+        self.failing = True
+        assert self.relay() == 2
+        self.failing = False
+        assert Event.objects.filter(date_processed__isnull=True).count() == 2
+        assert Event.objects.get(payload__n=1).error == "RuntimeError('Handler failed')"
+        # The events in flight hold back the aggregate until they are due for a retry
+        self.publish(1, 3)
+        assert self.relay() == 0
+        Event.objects.update(date_published=timezone.now() - timedelta(seconds=RELAY_RETRY + 1))
+        assert self.relay() == 3
+        assert self.handled == [(1, 1), (1, 2), (1, 3)]
+
+    def test_failing_event_is_dead_lettered(self):
+        self.publish(1, 1)
+        self.publish(1, 2)
+        self.failing = True
+        for _ in range(RELAY_MAX_ATTEMPTS):
+            assert self.relay() == 2
+            Event.objects.update(date_published=timezone.now() - timedelta(seconds=RELAY_RETRY + 1))
+        self.failing = False
+        # The first event gave up, the second one was never handled and is delivered again
+        assert self.relay() == 1
+        assert self.handled == [(1, 2)]
+        failed = Event.objects.get(payload__n=1)
+        assert failed.date_failed is not None and failed.date_processed is None
+
+    def test_prune_processed_events(self):
+        self.publish(1, 1)
+        self.publish(2, 2)
+        self.relay()
+        Event.objects.filter(payload__n=1).update(date_processed=timezone.now() - timedelta(days=8))
+        assert prune_events() == 1
+        assert list(Event.objects.values_list('payload__n', flat=True)) == [2]
@@ -0,0 +1,109 @@
+from django.db.models import Q
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from swipe.authentication import ClaimsJWTAuthentication
+from ads.models import Announcement
+from ads.serializers import AnnouncementListSerializer, ResidentialComplexListSerializer
+from housing.models import ResidentialComplex
+from users.models import Message
+from users.serializers import MessageSerializer
+from .models import Change
+from .services.changes import SyncTokenExpired, collect_changes
+
+
+# Create your views here.
+
+
+@extend_schema(
+    tags=['sync'],
+    description='Changes of the feed, favorites and messages after the token of the previous sync, '
+                'the changes of the last minutes before the token are returned again. '
+                'Without a token only the current token is returned, an expired token gets 410. '
+                'Permissions: IsAuthenticated',
+    parameters=[
+        OpenApiParameter(
+            name='token', description='Token returned by the previous sync', required=False, type=int
+        )
+    ],
+    responses=status.HTTP_200_OK,
+    examples=[OpenApiExample('Example', value={
+        'token': 1024, 'has_more': False,
+        'announcement': {'updated': [], 'deleted': [12]},
+        'residential_complex': {'updated': [], 'deleted': []},
+        'favorite_announcement': {'updated': [3], 'deleted': []},
+        'favorite_residential_complex': {'updated': [], 'deleted': [7]},
+        'message': {'updated': [], 'deleted': []}
+    })]
+)
+class SyncView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
+    limit = 500
+
+    querysets = {
+        Change.Kind.ANNOUNCEMENT: (
+            lambda: Announcement.objects.select_related(
+                'advertising', 'announcement_apartment'
+            ).prefetch_related('favorite_announcement', 'gallery_announcement'),
+            AnnouncementListSerializer
+        ),
+        Change.Kind.RESIDENTIAL_COMPLEX: (
+            lambda: ResidentialComplex.objects.prefetch_related('gallery_residential_complex', 'favorite_complex'),
+            ResidentialComplexListSerializer
+        ),
+    }
+
+    def get_message_queryset(self):
+        return Message.objects.filter(
+            Q(sender_id=self.request.user.pk) | Q(recipient_id=self.request.user.pk)
+        ).prefetch_related('message_files')
+
+    def serialize(self, queryset, serializer_class, changes):
+        """
+        Split ``changes`` into serialized updated objects and ids of deleted ones,
+        objects gone since they were updated count as deleted
+        """
+        updated = [object_id for object_id, action in changes.items() if action == Change.Action.UPDATED]
+        objects = queryset.filter(id__in=updated).order_by('id') if updated else queryset.none()
+        found = {obj.id for obj in objects}
+        data = serializer_class(objects, many=True, context={'request': self.request}).data if found else []
+        deleted = sorted(object_id for object_id in changes if object_id not in found)
+        return {'updated': data, 'deleted': deleted}
+
+    def split(self, changes):
+        return {
+            'updated': sorted(object_id for object_id, action in changes.items() if action == Change.Action.UPDATED),
+            'deleted': sorted(object_id for object_id, action in changes.items() if action == Change.Action.DELETED)
+        }
+
+    def get(self, request):
+        token = request.query_params.get('token')
+        if token is None:
+            last = Change.objects.order_by('-id').values_list('id', flat=True).first()
+            changes, token, has_more = {kind: {} for kind in Change.Kind.values}, last or 0, False
+        else:
+            try:
+                token = int(token)
+            except ValueError:
+                return Response({'token': 'Must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+            if token < 0:
+                return Response({'token': 'Must not be negative'}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                changes, token, has_more = collect_changes(request.user.pk, token, self.limit)
+            except SyncTokenExpired:
+                return Response({'token': 'Expired, sync again without a token'}, status=status.HTTP_410_GONE)
+
+        data = {'token': token, 'has_more': has_more}
+        for kind, (get_queryset, serializer_class) in self.querysets.items():
+            data[kind] = self.serialize(get_queryset(), serializer_class, changes[kind])
+        data[Change.Kind.MESSAGE] = self.serialize(
+            self.get_message_queryset(), MessageSerializer, changes[Change.Kind.MESSAGE]
+        )
+        data[Change.Kind.FAVORITE_ANNOUNCEMENT] = self.split(changes[Change.Kind.FAVORITE_ANNOUNCEMENT])
+        data[Change.Kind.FAVORITE_RESIDENTIAL_COMPLEX] = self.split(
+            changes[Change.Kind.FAVORITE_RESIDENTIAL_COMPLEX]
+        )
+        return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,19 @@
+from allauth.account.adapter import DefaultAccountAdapter
+from django.db import transaction
+
+from .tasks import send_email
+
+
+class AccountAdapter(DefaultAccountAdapter):
+    """
+    The emails of allauth (email confirmation on registration, ...) are rendered in the request
+    and sent by Celery once the transaction commits, the registration does not wait for the SMTP server
+    """
+
+    def send_mail(self, template_prefix, email, context):
+        message = self.render_mail(template_prefix, email, context)
+        kwargs = {
+            'subject': message.subject, 'body': message.body, 'from_email': message.from_email, 'to': message.to,
+            'alternatives': getattr(message, 'alternatives', []), 'content_subtype': message.content_subtype
+        }
+        transaction.on_commit(lambda: send_email.delay(**kwargs))
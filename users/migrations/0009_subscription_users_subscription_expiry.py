@@ -0,0 +1,17 @@
+# Generated by Django 3.2.14 on 2026-10-19 02:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_auto_20220914_1246'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_auto_renewal', True), _connector='OR'), fields=['date_end'], name='users_subscription_expiry'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.14 on 2026-10-19 02:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_subscription_users_subscription_expiry'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='subscription',
+            name='users_subscription_expiry',
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(condition=models.Q(('is_auto_renewal', True)), fields=['date_end'], name='users_subscription_renewal'),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_auto_renewal', False)), fields=['date_end'], name='users_subscription_expiry'),
+        ),
+    ]
@@ -111,6 +111,18 @@ class Subscription(models.Model):
         User, on_delete=models.CASCADE, related_name='subscription', null=True, blank=True
     )
 
+    class Meta:
+        indexes = [
+            # Subscriptions to renew and to deactivate by their end, one per task, see swipe.expiry
+            models.Index(
+                fields=['date_end'], name='users_subscription_renewal', condition=models.Q(is_auto_renewal=True)
+            ),
+            models.Index(
+                fields=['date_end'], name='users_subscription_expiry',
+                condition=models.Q(is_auto_renewal=False, is_active=True)
+            ),
+        ]
+
 
 class Contact(models.Model):
     class TYPES(models.TextChoices):
@@ -1,12 +1,12 @@
 from rest_framework import permissions
+from swipe.ownership import OwnershipPermission
 
 
-class IsMyFilter(permissions.BasePermission):
+class IsMyFilter(OwnershipPermission):
     """
     Gives access to personal filters only
     """
-    def has_object_permission(self, request, view, obj):
-        return bool(request.user.user_filter.filter(id=obj.pk).exists())
+    user_path = 'user_id'
 
 
 class IsDeveloper(permissions.BasePermission):
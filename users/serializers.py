@@ -4,6 +4,9 @@ from dj_rest_auth.serializers import LoginSerializer
 from django.contrib.auth import get_user_model
 from drf_spectacular.utils import extend_schema_serializer, OpenApiExample
 from rest_framework import serializers
+
+from sync.models import Change, Event
+from sync.services.events import publish_event
 from .models import (
     Notary, Subscription, Contact, MessageFile, Message, Filter
 )
@@ -57,7 +60,7 @@ class MessageSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Message
-        fields = ['file', 'text', 'message_files', 'sender', 'recipient', 'is_feedback']
+        fields = ['id', 'file', 'text', 'message_files', 'sender', 'recipient', 'is_feedback']
         read_only_fields = ['sender', 'message_files']
 
     def create(self, validated_data):
@@ -68,6 +71,10 @@ class MessageSerializer(serializers.ModelSerializer):
         if files:
             for file in files:
                 MessageFile.objects.create(file=file, message=instance)
+        publish_event(
+            Event.Name.MESSAGE_SENT, Change.Kind.MESSAGE, instance.id,
+            sender_id=instance.sender_id, recipient_id=instance.recipient_id
+        )
         return instance
 
 
@@ -0,0 +1,20 @@
+from swipe.versioning import version_key, bump_versions
+
+
+def bump_filter_versions(user_ids):
+    bump_versions(version_key('filters', pk) for pk in user_ids if pk is not None)
+
+
+def bump_favorites_versions(name, user_ids):
+    """
+    Invalidate the ``name`` favorites (``favorites_announcement`` or ``favorites_complex``) of users
+    """
+    bump_versions(version_key(name, pk) for pk in user_ids)
+
+
+def bump_notary_versions():
+    bump_versions([version_key('notary')])
+
+
+def notary_version_keys(view, request, *args, **kwargs):
+    return [version_key('notary')]
@@ -1,7 +1,16 @@
 from users.services.initial_data_for_user import create_agent, create_subscription, create_residential_complex
+from users.services.versions import bump_filter_versions, bump_favorites_versions, bump_notary_versions
+from ads.models import Announcement
+from ads.services.versions import bump_announcement_versions
+from housing.models import ResidentialComplex
+from housing.services.versions import bump_residential_complex_versions
 from django.contrib.auth import get_user_model
+from swipe.authentication import forget_cached_user
+from swipe.denylist import set_denied
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from .models import Contact, Filter, Notary
 
 User = get_user_model()
 
@@ -16,3 +25,80 @@ def post_save_user(created, **kwargs):
             if instance.is_developer is False:
                 create_agent(instance)
                 create_subscription(instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user(instance, **kwargs):
+    forget_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_blacklist_changed(instance, update_fields=None, **kwargs):
+    if update_fields == frozenset(['last_login']):
+        return
+    user_id, denied = instance.pk, instance.is_blacklist and kwargs['signal'] is post_save
+    transaction.on_commit(lambda: set_denied(user_id, denied))
+
+
+@receiver(post_save, sender=User)
+def user_changed(instance, created, update_fields=None, **kwargs):
+    """
+    The creator of announcements and the builder of a complex are shown with them
+    """
+    if created or update_fields == frozenset(['last_login']):
+        return
+    announcements = list(Announcement.objects.filter(creator=instance).values_list('id', 'residential_complex_id'))
+    if announcements:
+        bump_announcement_versions(*zip(*announcements))
+    if instance.is_developer:
+        bump_residential_complex_versions(
+            ResidentialComplex.objects.filter(user=instance).values_list('id', flat=True)
+        )
+
+
+@receiver(post_save, sender=Contact)
+@receiver(post_delete, sender=Contact)
+def contact_changed(instance, **kwargs):
+    if instance.residential_complex_id:
+        bump_residential_complex_versions([instance.residential_complex_id])
+
+
+@receiver(post_save, sender=Notary)
+@receiver(post_delete, sender=Notary)
+def notary_changed(**kwargs):
+    bump_notary_versions()
+
+
+@receiver(post_save, sender=Filter)
+@receiver(post_delete, sender=Filter)
+def filter_changed(instance, **kwargs):
+    bump_filter_versions([instance.user_id])
+
+
+def _changed_pks(instance, action, reverse, pk_set, field_name, related_name):
+    if action == 'pre_clear':
+        manager = getattr(instance, related_name if reverse else field_name)
+        return set(manager.values_list('pk', flat=True))
+    return pk_set or set()
+
+
+@receiver(m2m_changed, sender=User.favorites_announcement.through)
+def favorites_announcement_changed(instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    pks = _changed_pks(instance, action, reverse, pk_set, 'favorites_announcement', 'favorite_announcement')
+    user_ids, announcement_ids = (pks, [instance.pk]) if reverse else ([instance.pk], pks)
+    bump_favorites_versions('favorites_announcement', user_ids)
+    bump_announcement_versions(announcement_ids)
+
+
+@receiver(m2m_changed, sender=User.favorites_residential_complex.through)
+def favorites_residential_complex_changed(instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    pks = _changed_pks(instance, action, reverse, pk_set, 'favorites_residential_complex', 'favorite_complex')
+    user_ids, residential_complex_ids = (pks, [instance.pk]) if reverse else ([instance.pk], pks)
+    bump_favorites_versions('favorites_complex', user_ids)
+    bump_residential_complex_versions(residential_complex_ids)
@@ -1,33 +1,48 @@
 from .services.month_ahead import get_range_month
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
 from .models import Subscription
-from datetime import datetime
 from swipe.celery import app
+from swipe.expiry import expire_due
 
 
 @app.task
 def activate_user_subscription():
     """
-    Renewing a user's subscription (is_auto_renewal=True)
+    Renewing a user's subscription (is_auto_renewal=True), runs every minute on the due subscriptions only
     """
-    print('task "activate_user_subscription" send')
-    subscription = Subscription.objects.filter(is_auto_renewal=True, date_end__lt=datetime.now())
-    subscription.update(date_end=get_range_month().date())
-    print('task "activate_user_subscription" complete')
+    def renew(subscription):
+        subscription.update(date_end=get_range_month().date())
+
+    renewed = expire_due(Subscription.objects.filter(is_auto_renewal=True), renew)
+    if renewed:
+        print(f'task "activate_user_subscription" complete, {renewed} subscriptions')
 
 
 @app.task
 def deactivate_user_subscription():
     """
-    Deactivate the user's subscription after the end of the end date and send mail (is_auto_renewal=False)
+    Deactivate the user's subscription after the end of the end date and send mail (is_auto_renewal=False),
+    runs every minute on the due subscriptions only
+    """
+    def deactivate(subscription):
+        emails = list(subscription.values_list('user__email', flat=True))
+        subscription.update(is_active=False)
+        # Mailed once the batch is committed, a failing mail server does not roll it back
+        transaction.on_commit(lambda: send_email.delay('SWIPE', 'Your subscription has expired', None, emails))
+
+    expired = expire_due(Subscription.objects.filter(is_auto_renewal=False, is_active=True), deactivate)
+    if expired:
+        print(f'task "deactivate_user_subscription" complete, {expired} subscriptions')
+
+
+@app.task
+def send_email(subject, body, from_email, to, alternatives=(), content_subtype='plain'):
+    """
+    Send an email rendered in a request
     """
-    print('task "deactivate_user_subscription" send')
-    subscription = Subscription.objects.filter(is_auto_renewal=False, is_active=True, date_end__lt=datetime.now())
-    send_mail('SWIPE',
-              'Your subscription has expired',
-              None,
-              list(subscription.values_list('user__email', flat=True)),
-              fail_silently=False
-              )
-    subscription.update(is_active=False)
-    print('task "deactivate_user_subscription" complete')
+    message = EmailMultiAlternatives(
+        subject, body, from_email, to, alternatives=[tuple(alternative) for alternative in alternatives]
+    )
+    message.content_subtype = content_subtype
+    message.send()
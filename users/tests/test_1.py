@@ -1,8 +1,24 @@
+from datetime import timedelta
+from unittest import mock
+
 from allauth.account.models import EmailAddress
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.core import mail
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APIClient, APITestCase
-from users.models import Notary, Filter
+from rest_framework_simplejwt.tokens import AccessToken
+from swipe.celery import app
+from swipe.denylist import deny_set, is_denied
+from swipe.middleware import HTMLCsrfViewMiddleware
+from users.models import Notary, Filter, Subscription
+from users.views import UserProfileViewSet
+from users.tasks import activate_user_subscription, deactivate_user_subscription
 
 # Create your tests here.
 
@@ -21,8 +37,25 @@ class RegistrationTestCase(APITestCase):
             "first_name": "Test-user",
             "last_name": "Test-user"
         }
-        response = self.client.post(url, data=data)
+        app.conf.update(task_always_eager=True)
+        self.addCleanup(app.conf.update, task_always_eager=False)
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(url, data=data)
         assert response.status_code == 201
+        assert mail.outbox == []
+        for callback in callbacks:
+            callback()
+        assert mail.outbox[0].to == ['user@example.com']
+
+    def test_html_pages_check_csrf(self):
+        def view(request):
+            return HttpResponse()
+
+        middleware = HTMLCsrfViewMiddleware(view)
+        for path, checked in [('/accounts/email/', True), ('/registration/', True), ('/user-filter/', False)]:
+            request = RequestFactory().post(path)
+            response = middleware.process_view(request, view, (), {})
+            assert (response is not None and response.status_code == 403) is checked
 
 
 class LoginUserTestCase(APITestCase):
@@ -52,9 +85,62 @@ class LoginUserTestCase(APITestCase):
         assert response.status_code == 200
 
 
+class CachedAuthenticationTestCase(LoginUserTestCase):
+
+    def user_queries(self, url, token):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        assert response.status_code == 200
+        return [query for query in queries.captured_queries if 'FROM "users_user" WHERE' in query['sql']]
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        deny_set.reload()
+
+    def obtain_token(self):
+        response = self.client.post(reverse('token_obtain_pair'), {'email': 'user@example.com', 'password': 'Zaqwerty123'})
+        return response.json()['access']
+
+    def test_cached_user(self):
+        token = self.obtain_token()
+        assert AccessToken(token)['is_developer'] is False
+
+        url = reverse('users:user-profile-get-profile')
+        assert len(self.user_queries(url, token)) == 1
+        assert self.user_queries(url, token) == []
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = 'Changed'
+            self.user.save()
+        assert len(self.user_queries(url, token)) == 1
+
+        cache.clear()
+        assert self.user_queries(reverse('ads:announcement-feed-list'), token) == []
+
+    def test_blacklisted_user(self):
+        token = self.obtain_token()
+        url = reverse('users:user-profile-get-profile')
+        assert self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}').status_code == 200
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_blacklist = True
+            self.user.save()
+        for url in (url, reverse('ads:announcement-feed-list')):
+            response = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+            assert response.status_code == 401
+            assert response.json()['detail'] == 'User is blacklisted'
+
+        deny_set.reload()
+        assert is_denied(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_blacklist = False
+            self.user.save()
+        assert self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}').status_code == 200
+
+
 class BaseTestCase(APITestCase):
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create(
             email='admin@admin.com',
             first_name='Test',
@@ -66,6 +152,43 @@ class BaseTestCase(APITestCase):
         self.client.force_authenticate(user=self.user)
 
 
+class SubscriptionExpiryTestCase(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        app.conf.update(task_always_eager=True)
+        self.addCleanup(app.conf.update, task_always_eager=False)
+
+    def expire(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            deactivate_user_subscription()
+            activate_user_subscription()
+
+    def test_due_subscriptions_expire(self):
+        other = User.objects.create(email='other@admin.com', first_name='Test', last_name='Test')
+        yesterday = timezone.localdate() - timedelta(days=1)
+        Subscription.objects.filter(user=self.user).update(date_end=yesterday, is_active=True, is_auto_renewal=False)
+        Subscription.objects.filter(user=other).update(date_end=yesterday, is_active=True, is_auto_renewal=True)
+
+        self.expire()
+        subscription = Subscription.objects.get(user=self.user)
+        assert (subscription.is_active, subscription.date_end) == (False, yesterday)
+        assert Subscription.objects.get(user=other).date_end > timezone.localdate()
+        assert [message.to for message in mail.outbox] == [[self.user.email]]
+
+        self.expire()
+        assert len(mail.outbox) == 1
+
+    def test_failed_mail_keeps_subscription_expired(self):
+        Subscription.objects.filter(user=self.user).update(
+            date_end=timezone.localdate() - timedelta(days=1), is_active=True, is_auto_renewal=False
+        )
+        with mock.patch('users.tasks.EmailMultiAlternatives.send', side_effect=ConnectionRefusedError) as send:
+            self.expire()
+        assert send.called and mail.outbox == []
+        assert not Subscription.objects.get(user=self.user).is_active
+
+
 class NotaryTestCase(BaseTestCase):
 
     def test_create(self):
@@ -218,3 +341,52 @@ class FilterTestCase(BaseTestCase):
         url = reverse('users:user-filter-list')
         response = self.client.get(url)
         assert response.status_code == 200
+
+
+class BatchTestCase(BaseTestCase):
+
+    def test_batch(self):
+        url = reverse('batch')
+        data = {'requests': [
+            {'id': 'profile', 'url': reverse('users:user-profile-get-profile') + '?fields=email'},
+            {'id': 'filters', 'url': reverse('users:user-filter-list')},
+            {'id': 'missing', 'url': '/missing/'},
+            {'id': 'nested', 'url': url},
+        ]}
+        response = self.client.post(url, data=data, format='json')
+        assert response.status_code == 200
+        profile, filters, missing, nested = response.json()['responses']
+        assert profile == {'id': 'profile', 'status': 200, 'headers': {}, 'body': {'email': 'admin@admin.com'}}
+        assert filters['status'] == 200 and filters['body'] == []
+        assert missing['status'] == 404
+        assert nested['status'] == 400
+
+    def test_batch_rejects_html_pages(self):
+        data = {'requests': [{'url': reverse('users:user-filter-list')}, {'url': '/accounts/login/'}]}
+        response = self.client.post(reverse('batch'), data=data, format='json')
+        assert response.status_code == 400
+
+    def test_batch_failed_sub_request(self):
+        data = {'requests': [
+            {'id': 'profile', 'url': reverse('users:user-profile-get-profile')},
+            {'id': 'filters', 'url': reverse('users:user-filter-list')},
+        ]}
+        with mock.patch.object(UserProfileViewSet, 'get_profile', side_effect=RuntimeError), \
+                mock.patch('swipe.batch.logger'):
+            response = self.client.post(reverse('batch'), data=data, format='json')
+        assert response.status_code == 200
+        profile, filters = response.json()['responses']
+        assert profile == {'id': 'profile', 'status': 500, 'headers': {}, 'body': None}
+        assert filters['status'] == 200
+
+    def test_batch_write(self):
+        url = reverse('batch')
+        data = {'requests': [
+            {'method': 'PUT', 'url': reverse('users:user-subscription-auto-renewal-subscription'),
+             'body': {'is_auto_renewal': False}},
+            {'url': reverse('users:user-subscription-get-subscription') + '?fields=is_auto_renewal'},
+        ]}
+        response = self.client.post(url, data=data, format='json')
+        update, subscription = response.json()['responses']
+        assert update['status'] == 200
+        assert subscription['body'] == {'is_auto_renewal': False}
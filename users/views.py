@@ -11,8 +11,14 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.response import Response
 from drf_psq import PsqMixin, Rule
 from rest_framework.viewsets import GenericViewSet
+from swipe.mixins import FieldsetMixin, SparseFieldsMixin
+from swipe.caching import cached_page_data
+from swipe.idempotency import IdempotentCreateMixin
+from swipe.parsers import MessagePackParser
+from swipe.versioning import versioned
 from .permissions import IsMyFilter
 from .services.month_ahead import get_range_month
+from .services.versions import notary_version_keys
 from .models import (
     Notary, Contact, Subscription, Message, Filter
 )
@@ -32,6 +38,7 @@ User = get_user_model()
     description='Management a user filters. Permissions: [IsMyFilter, IsAuthenticated]'
 )
 class FilterViewSet(PsqMixin,
+                    SparseFieldsMixin,
                     mixins.CreateModelMixin,
                     mixins.RetrieveModelMixin,
                     mixins.UpdateModelMixin,
@@ -57,7 +64,7 @@ class FilterViewSet(PsqMixin,
     methods=['PUT', 'POST', 'DELETE'],
     description='Management a notaries(delete, update and create new) Permissions: IsAdminUser'
 )
-class NotaryViewSet(PsqMixin, viewsets.ModelViewSet):
+class NotaryViewSet(PsqMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
     serializer_class = NotarySerializer
     queryset = Notary.objects.all()
@@ -68,6 +75,13 @@ class NotaryViewSet(PsqMixin, viewsets.ModelViewSet):
         ('list', 'retrieve'): [Rule([IsAuthenticated])]
     }
 
+    @versioned(notary_version_keys)
+    def list(self, request, *args, **kwargs):
+        data = cached_page_data(
+            self, 'notary', lambda: super(NotaryViewSet, self).list(request, *args, **kwargs).data
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
     @extend_schema(responses=status.HTTP_200_OK,
                    description='Delete notary Permissions: IsAdminUser',
                    examples=[OpenApiExample('Example',
@@ -96,12 +110,15 @@ class NotaryViewSet(PsqMixin, viewsets.ModelViewSet):
 )
 @extend_schema(
     description='Messaging between users and between the user and technical support. Permissions: IsAuthenticated')
-class MessageViewSet(mixins.CreateModelMixin,
+class MessageViewSet(IdempotentCreateMixin,
+                     SparseFieldsMixin,
+                     mixins.CreateModelMixin,
                      mixins.ListModelMixin,
                      GenericViewSet):
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser]
+    throttle_scopes = {'create': 'message'}
 
     def get_queryset(self):
         user_id = self.request.query_params.get('user_id')
@@ -117,7 +134,7 @@ class MessageViewSet(mixins.CreateModelMixin,
         return queryset
 
 
-class UserProfileViewSet(viewsets.ViewSet):
+class UserProfileViewSet(FieldsetMixin, viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = UserProfileSerializer
     parser_classes = [MultiPartParser, FormParser]
@@ -125,7 +142,7 @@ class UserProfileViewSet(viewsets.ViewSet):
     @extend_schema(description='Get user data, Permissions: IsAuthenticated', methods=["GET"])
     @action(detail=False)
     def get_profile(self, request):
-        serializer = self.serializer_class(request.user)
+        serializer = self.get_sparse_serializer(self.serializer_class, request.user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @extend_schema(description='Update user data, Permissions: IsAuthenticated', methods=["PUT"])
@@ -159,7 +176,7 @@ class UserProfileViewSet(viewsets.ViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class UserAgentViewSet(viewsets.ViewSet):
+class UserAgentViewSet(FieldsetMixin, viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = UserAgentSerializer
     parser_classes = [MultiPartParser]
@@ -168,7 +185,7 @@ class UserAgentViewSet(viewsets.ViewSet):
     @action(detail=False)
     def get_agent(self, request):
         obj = get_object_or_404(Contact, user=request.user)
-        serializer = self.serializer_class(obj)
+        serializer = self.get_sparse_serializer(self.serializer_class, obj)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @extend_schema(description='Update agent data, Permissions: IsAuthenticated', methods=["PUT"])
@@ -181,7 +198,7 @@ class UserAgentViewSet(viewsets.ViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class UserSubscriptionViewSet(viewsets.ViewSet):
+class UserSubscriptionViewSet(FieldsetMixin, viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = UserSubscriptionSerializer
 
@@ -189,7 +206,7 @@ class UserSubscriptionViewSet(viewsets.ViewSet):
     @action(detail=False)
     def get_subscription(self, request):
         obj = get_object_or_404(Subscription, user=request.user)
-        serializer = self.serializer_class(obj)
+        serializer = self.get_sparse_serializer(self.serializer_class, obj)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @extend_schema(description='Activate not active subscription, Permissions: IsAuthenticated', methods=['PUT'])
@@ -228,7 +245,7 @@ class UserSubscriptionViewSet(viewsets.ViewSet):
         detail=False,
         methods=['PUT'],
         serializer_class=UserAutoRenewalSubscriptionSerializer,
-        parser_classes=[JSONParser]
+        parser_classes=[JSONParser, MessagePackParser]
 
     )
     def auto_renewal_subscription(self, request):
@@ -241,6 +258,7 @@ class UserSubscriptionViewSet(viewsets.ViewSet):
 
 @extend_schema(description='List all users and filter for user in blacklist. Permissions: IsAdminUser')
 class UserListViewSet(PsqMixin,
+                      SparseFieldsMixin,
                       mixins.RetrieveModelMixin,
                       mixins.UpdateModelMixin,
                       mixins.ListModelMixin,
@@ -248,7 +266,7 @@ class UserListViewSet(PsqMixin,
     queryset = User.objects.all()
     serializer_class = UserListSerializer
     permission_classes = [IsAdminUser]
-    parser_classes = [JSONParser]
+    parser_classes = [JSONParser, MessagePackParser]
     filter_backends = [DjangoFilterBackend, SearchFilter]
     filterset_fields = ['is_blacklist']
     search_fields = ['id', 'first_name', 'last_name', 'phone', 'email']